@@ -0,0 +1,28 @@
+"""Compare batch_inverse with inverting each element by mod_inverse
+and by Fermat's little theorem with power_mod.
+"""
+
+import random
+from timeit import timeit
+
+import lib_path
+from smalllab.nt import batch_inverse, mod_inverse, power_mod
+
+
+def bench(p: int, count: int) -> None:
+    random.seed(count)
+    values = [random.randrange(1, p) for _ in range(count)]
+    bits = p.bit_length()
+
+    timings = {
+        "fermat": timeit(lambda: [power_mod(a, p - 2, p) for a in values], number=1),
+        "mod_inverse": timeit(lambda: [mod_inverse(a, p) for a in values], number=1),
+        "batch_inverse": timeit(lambda: batch_inverse(values, p), number=1),
+    }
+    for name, t in timings.items():
+        print(f"{bits:5} bits  {name:14} {t / count * 1e6:10.2f} us")
+
+
+if __name__ == "__main__":
+    for p, count in [(2**61 - 1, 100000), (2**127 - 1, 50000), (2**521 - 1, 5000), (2**2203 - 1, 500)]:
+        bench(p, count)
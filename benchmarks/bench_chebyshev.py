@@ -0,0 +1,39 @@
+"""Compare chebyshev_coef with the recurrence of earlier versions."""
+
+from timeit import timeit
+
+import lib_path
+from smalllab.calculus import _chebyshev_coef, chebyshev_coef, chebyshev_polys
+
+
+def chebyshev_coef_recurrence(n: int) -> list:
+    """The chebyshev_coef of earlier versions."""
+    if n == 0:
+        return [1]
+    T0 = [1]
+    T1 = [1, 0]
+    for j in range(2, n+1):
+        T2 = [2*a for a in T1]
+        T2.append(0)
+        for k in range(j-1):
+            T2[2+k] -= T0[k]
+        T0 = T1.copy()
+        T1 = T2.copy()
+    return T1
+
+
+def bench(n: int) -> None:
+    _chebyshev_coef.cache_clear()
+    timings = {
+        "recurrence": timeit(lambda: chebyshev_coef_recurrence(n), number=1),
+        "formula": timeit(lambda: chebyshev_coef(n), number=1),
+        "cached": timeit(lambda: chebyshev_coef(n), number=1),
+        "all degrees": timeit(lambda: sum(1 for T in chebyshev_polys(n)), number=1),
+    }
+    for name, t in timings.items():
+        print(f"n = {n:5}  {name:12} {t * 1e3:10.2f} ms")
+
+
+if __name__ == "__main__":
+    for n in [10, 100, 1000, 5000]:
+        bench(n)
@@ -0,0 +1,35 @@
+"""Compare is_square and squares_in with the isqrt-only is_square
+of earlier versions, on random and on structured inputs.
+"""
+
+import random
+from math import isqrt
+from timeit import timeit
+
+import lib_path
+from smalllab.nt import is_square, primes_up_to, squares_in
+
+
+def is_square_isqrt(n) -> bool:
+    """The is_square of earlier versions."""
+    if n < 0:
+        return False
+    if n != int(n):
+        return False
+    return n == isqrt(int(n)) ** 2
+
+
+def bench(name: str, L: list[int]) -> None:
+    old = timeit(lambda: [n for n in L if is_square_isqrt(n)], number=1)
+    new = timeit(lambda: [n for n in L if is_square(n)], number=1)
+    bulk = timeit(lambda: squares_in(L), number=1)
+    print(f"{name:28} isqrt only {old:6.3f} s  is_square {new:6.3f} s"
+        f"  squares_in {bulk:6.3f} s  speedup {old / new:4.1f} / {old / bulk:4.1f}")
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    bench("random 64-bit integers", [random.getrandbits(64) for _ in range(10**6)])
+    bench("random 1024-bit integers", [random.getrandbits(1024) for _ in range(10**5)])
+    bench("p - 1 for primes p < 10^7", [p - 1 for p in primes_up_to(10**7)])
+    bench("n^2 + k for k = 0, ..., 9", [n*n + k for n in range(10**5) for k in range(10)])
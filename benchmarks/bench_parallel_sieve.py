@@ -0,0 +1,24 @@
+"""Measure how parallel_primes_between scales with the number of
+processes, against the serial primes_between.
+"""
+
+import os
+from timeit import timeit
+
+import lib_path
+from smalllab.nt import parallel_primes_between, primes_between
+
+
+def bench(lo: int, hi: int) -> None:
+    serial = timeit(lambda: primes_between(lo, hi), number=1)
+    print(f"[{lo}, {hi})  serial        {serial:7.2f} s")
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        t = timeit(lambda: parallel_primes_between(lo, hi, workers), number=1)
+        print(f"[{lo}, {hi})  {workers:2} processes  {t:7.2f} s  speedup {serial / t:5.2f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    bench(0, 10**8)
+    bench(10**12, 10**12 + 2*10**7)
@@ -0,0 +1,38 @@
+"""Compare poly_mul on integer coefficients (Kronecker substitution)
+and on float coefficients (Karatsuba) with schoolbook multiplication.
+"""
+
+import random
+from timeit import timeit
+
+import lib_path
+from smalllab.calculus import poly_mul
+
+
+def schoolbook(P: list, Q: list) -> list:
+    R = [0] * (len(P) + len(Q) - 1)
+    for i, a in enumerate(P):
+        for j, b in enumerate(Q):
+            R[i+j] += a * b
+    return R
+
+
+def bench(n: int) -> None:
+    random.seed(n)
+    P = [random.randint(-2**30, 2**30) for _ in range(n)]
+    Q = [random.randint(-2**30, 2**30) for _ in range(n)]
+    Pf, Qf = [float(a) for a in P], [float(b) for b in Q]
+
+    timings = {
+        "kronecker": timeit(lambda: poly_mul(P, Q), number=1),
+        "karatsuba": timeit(lambda: poly_mul(Pf, Qf), number=1),
+    }
+    if n <= 3000:
+        timings["schoolbook"] = timeit(lambda: schoolbook(P, Q), number=1)
+    for name, t in timings.items():
+        print(f"degree {n - 1:6}  {name:11} {t * 1e3:10.1f} ms")
+
+
+if __name__ == "__main__":
+    for n in [100, 1000, 3000, 10001]:
+        bench(n)
@@ -0,0 +1,42 @@
+"""Compare power_mod and ModContext with the successive squaring
+power_mod of earlier versions and the builtin pow.
+"""
+
+import random
+from timeit import timeit
+
+import lib_path
+from smalllab.nt import ModContext, power_mod
+
+
+def power_mod_squaring(a: int, k: int, m: int) -> int:
+    """The successive squaring power_mod of earlier versions."""
+    b = 1
+    while k >= 1:
+        if k % 2 == 1:
+            b = b*a % m
+        a = a**2 % m
+        k //= 2
+    return b
+
+
+def bench(bits: int, count: int) -> None:
+    random.seed(bits)
+    m = random.getrandbits(bits) | 1 | (1 << (bits-1))
+    exponents = [random.getrandbits(bits) for _ in range(count)]
+    context = ModContext(m)
+    context.precompute(3, bits)
+
+    timings = {
+        "squaring": timeit(lambda: [power_mod_squaring(3, k, m) for k in exponents], number=1),
+        "power_mod": timeit(lambda: [power_mod(3, k, m) for k in exponents], number=1),
+        "builtin pow": timeit(lambda: [pow(3, k, m) for k in exponents], number=1),
+        "fixed base": timeit(lambda: [context.pow(3, k) for k in exponents], number=1),
+    }
+    for name, t in timings.items():
+        print(f"{bits:5} bits  {name:12} {t / count * 1e6:10.1f} us")
+
+
+if __name__ == "__main__":
+    for bits, count in [(64, 20000), (256, 5000), (1024, 500), (4096, 20)]:
+        bench(bits, count)
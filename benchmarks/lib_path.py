@@ -0,0 +1,5 @@
+import os
+import sys
+lib_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if lib_path not in sys.path:
+    sys.path.append(lib_path)
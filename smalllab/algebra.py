@@ -1,10 +1,127 @@
 """This module contains functions related to algebra.
 """
 
-from smalllab.nt import gcd
+from collections.abc import Iterator
+from itertools import compress
+from math import gcd
+from smalllab.nt import decompose
 
 def units(n: int) -> list[int]:
-    """Find all natural number a < n where (a, n) = 1."""
+    """Find all natural number a < n where (a, n) = 1.
+
+    The multiples of each prime factor of n are struck out of a bytearray,
+    so no gcd is computed.
+    """
     if n < 2:
         raise ValueError("number must be greater than 1")
-    return [i for i in range(1, n) if gcd(i, n) == 1]
+
+    sieve = bytearray(b"\x01") * n
+    sieve[0] = 0
+    for p in decompose(n):
+        sieve[p::p] = bytes(len(range(p, n, p)))
+    return list(compress(range(n), sieve))
+
+
+def _group_order(n: int) -> tuple[int, list[int]]:
+    """Return phi(n) and its prime factors.
+
+    phi(n) is the product of p^(e-1) * (p-1) over the p^e || n, so only
+    the p - 1 are factored, not phi(n) itself.
+    """
+    phi = 1
+    Q = set()
+    for p, e in decompose(n).items():
+        phi *= p**(e - 1) * (p - 1)
+        if e > 1:
+            Q.add(p)
+        Q.update(decompose(p - 1) if p > 2 else ())
+    return phi, sorted(Q)
+
+
+def multiplicative_order(a: int, n: int) -> int:
+    """Find the least k >= 1 with a^k = 1 mod n, for a coprime to n.
+
+    The order divides phi(n); each prime q of phi(n) is divided out of
+    the exponent and multiplied back only while a^k is not 1.
+    """
+    if not ( isinstance(a, int) and isinstance(n, int) ):
+        raise TypeError("the arguments must be integers")
+    if n < 1:
+        raise ValueError("the modulus must be positive")
+    if gcd(a, n) != 1:
+        raise ValueError("a must be coprime to n")
+    if n == 1:
+        return 1
+
+    order, Q = _group_order(n)
+    for q in Q:
+        while order % q == 0:
+            order //= q
+        x = pow(a, order, n)
+        while x != 1:
+            x = pow(x, q, n)
+            order *= q
+    return order
+
+
+def _has_primitive_root(n: int) -> bool:
+    """Check if n is 2, 4, p^k or 2p^k for an odd prime p."""
+    if n in (2, 4):
+        return True
+    if n % 2 == 0:
+        n //= 2
+    return n > 1 and n % 2 == 1 and len(decompose(n)) == 1
+
+
+def _is_generator(g: int, n: int, phi: int, Q: list[int]) -> bool:
+    """Check if g generates (Z/nZ)* of order phi with prime factors Q."""
+    return gcd(g, n) == 1 and all(pow(g, phi // q, n) != 1 for q in Q)
+
+
+def is_primitive_root(g: int, n: int) -> bool:
+    """Check if g generates the group of units modulo n.
+
+    Only the exponents phi(n)/q for the primes q | phi(n) are tested.
+    """
+    if not ( isinstance(g, int) and isinstance(n, int) ):
+        raise TypeError("the arguments must be integers")
+    if n < 2:
+        raise ValueError("number must be greater than 1")
+    if not _has_primitive_root(n):
+        return False
+    return _is_generator(g % n, n, *_group_order(n))
+
+
+def primitive_root(n: int) -> int:
+    """Find the smallest primitive root modulo n.
+
+    Raises
+    ------
+    ValueError
+        If n is not 2, 4, p^k or 2p^k for an odd prime p.
+    """
+    if n < 2:
+        raise ValueError("number must be greater than 1")
+    if not _has_primitive_root(n):
+        raise ValueError(f"there is no primitive root modulo {n}")
+
+    phi, Q = _group_order(n)
+    g = 1
+    while not _is_generator(g, n, phi, Q):
+        g += 1
+    return g
+
+
+def primitive_roots(n: int) -> Iterator[int]:
+    """Yield all primitive roots modulo n, not in increasing order.
+
+    They are the g^k for the smallest primitive root g and the k < phi(n)
+    coprime to phi(n), so no unit is tested by powering.
+    """
+    g = primitive_root(n)
+    phi, Q = _group_order(n)
+    x = 1
+    for k in range(1, phi + 1):
+        x = x * g % n
+        if all(k % q for q in Q):
+            yield x
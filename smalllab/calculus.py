@@ -1,8 +1,12 @@
 """This module contains functions related to calculus.
 """
 
-from collections.abc import Callable
+from array import array
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
 from math import cos, pi
+import decimal
+import sys
 
 number = int | float
 
@@ -11,24 +15,465 @@ def sign(x: number) -> int:
     return (x > 0) - (x < 0)
 
 
-def list2poly(L: list[number]) -> Callable[[number], float]:
+class Polynomial:
+    """Polynomial function evaluated by Horner's rule.
+
+    Parameters
+    ----------
+    L : list of integer or float
+        The coefficients, the coefficient of highest-degree term first.
+
+    Notes
+    -----
+    Integer coefficients at an integer x are evaluated exactly in
+    integers. Otherwise real coefficients are read from an array('d')
+    made once, and other values go through the generic Horner loop.
+    """
+    __slots__ = ("coefs", "degree", "_floats", "_exact")
+
+    def __init__(self, L: list[number]):
+        if len(L) == 0:
+            raise ValueError("the list cannot be empty")
+        self.coefs = tuple(L)
+        self.degree = len(L) - 1
+        self._exact = all(type(c) is int for c in L)
+        try:
+            self._floats = array("d", L)
+        except (TypeError, OverflowError):
+            self._floats = None
+
+    def _coefficients(self, x: number) -> tuple | array:
+        """Return the coefficients to evaluate at x with."""
+        if self._exact and type(x) is int:
+            return self.coefs
+        if self._floats is not None and type(x) in (int, float):
+            return self._floats
+        return self.coefs
+
+    def __call__(self, x: number) -> number:
+        coefs = self._coefficients(x)
+        y = coefs[0]
+        for c in coefs[1:]:
+            y = y*x + c
+        return y
+
+    def eval_many(self, xs: Iterable[number]) -> list[number] | array:
+        """Evaluate the polynomial at every x of xs.
+
+        Returns
+        -------
+        array('d') if the values are computed in floats, else a list.
+        """
+        xs = list(xs)
+        if not xs:
+            return []
+        if len(set(map(type, xs))) > 1:
+            return [self(x) for x in xs]
+        coefs = self._coefficients(xs[0])
+
+        first, rest = coefs[0], coefs[1:]
+        values = []
+        for x in xs:
+            y = first
+            for c in rest:
+                y = y*x + c
+            values.append(y)
+        if coefs is self._floats:
+            return array("d", values)
+        return values
+
+    def to_list(self) -> list[number]:
+        """Return the coefficients, highest-degree term first."""
+        return list(self.coefs)
+
+    def to_sparse(self) -> "SparsePolynomial":
+        """Return the polynomial as a SparsePolynomial."""
+        return SparsePolynomial.from_list(self.coefs)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Polynomial):
+            return NotImplemented
+        return self.coefs == other.coefs
+
+    def __repr__(self) -> str:
+        return f"Polynomial({list(self.coefs)})"
+
+    def __str__(self) -> str:
+        return list2polystr(list(self.coefs))
+
+
+class SparsePolynomial:
+    """Polynomial function stored as its nonzero terms.
+
+    Parameters
+    ----------
+    terms : dict
+        The coefficient of each degree; zero coefficients are dropped.
+
+    Notes
+    -----
+    The terms are kept by decreasing degree and evaluated by Horner's
+    rule over them, with x^gap by the builtin exponentiation by
+    squaring for the gap between consecutive degrees.
+    """
+    __slots__ = ("terms", "degree")
+
+    def __init__(self, terms: dict[int, number]):
+        if any(not isinstance(d, int) or d < 0 for d in terms):
+            raise ValueError("degrees must be nonnegative integers")
+        self.terms = {d: terms[d] for d in sorted(terms, reverse=True) if terms[d] != 0}
+        self.degree = next(iter(self.terms), 0)
+
+    @classmethod
+    def from_list(cls, L: list[number]) -> "SparsePolynomial":
+        """Return the polynomial with coefficients in L, highest-degree first."""
+        deg = len(L) - 1
+        return cls({deg - j: c for j, c in enumerate(L) if c != 0})
+
+    def to_list(self) -> list[number]:
+        """Return the dense coefficients, highest-degree term first."""
+        L = [0] * (self.degree + 1)
+        for d, c in self.terms.items():
+            L[self.degree - d] = c
+        return L
+
+    def to_dense(self) -> Polynomial:
+        """Return the polynomial as a dense Polynomial."""
+        return Polynomial(self.to_list())
+
+    def __call__(self, x: number) -> number:
+        y = 0
+        previous = self.degree
+        for d, c in self.terms.items():
+            y = y * x**(previous - d) + c
+            previous = d
+        return y * x**previous
+
+    def eval_many(self, xs: Iterable[number]) -> list[number] | array:
+        """Evaluate the polynomial at every x of xs.
+
+        Returns
+        -------
+        array('d') if Polynomial.eval_many would compute the values in
+        floats, else a list.
+        """
+        xs = list(xs)
+        values = [self(x) for x in xs]
+        types = set(map(type, xs))
+        if len(types) != 1 or not types <= {int, float}:
+            return values
+        if int in types and all(type(c) is int for c in self.terms.values()):
+            return values
+        try:
+            return array("d", values)
+        except (TypeError, OverflowError):
+            return values
+
+    def _coerce(self, other: "SparsePolynomial | Polynomial | number") -> dict[int, number] | None:
+        if isinstance(other, SparsePolynomial):
+            return other.terms
+        if isinstance(other, Polynomial):
+            return SparsePolynomial.from_list(other.coefs).terms
+        if isinstance(other, (int, float)):
+            return {0: other}
+        return None
+
+    def __add__(self, other: "SparsePolynomial | Polynomial | number") -> "SparsePolynomial":
+        terms = self._coerce(other)
+        if terms is None:
+            return NotImplemented
+        sum = dict(self.terms)
+        for d, c in terms.items():
+            sum[d] = sum.get(d, 0) + c
+        return SparsePolynomial(sum)
+
+    __radd__ = __add__
+
+    def __neg__(self) -> "SparsePolynomial":
+        return SparsePolynomial({d: -c for d, c in self.terms.items()})
+
+    def __sub__(self, other: "SparsePolynomial | Polynomial | number") -> "SparsePolynomial":
+        terms = self._coerce(other)
+        if terms is None:
+            return NotImplemented
+        return self + -SparsePolynomial(terms)
+
+    def __rsub__(self, other: "SparsePolynomial | Polynomial | number") -> "SparsePolynomial":
+        return -self + other
+
+    def __mul__(self, other: "SparsePolynomial | Polynomial | number") -> "SparsePolynomial":
+        terms = self._coerce(other)
+        if terms is None:
+            return NotImplemented
+        product = {}
+        for d1, c1 in self.terms.items():
+            for d2, c2 in terms.items():
+                product[d1 + d2] = product.get(d1 + d2, 0) + c1 * c2
+        return SparsePolynomial(product)
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other: "SparsePolynomial | Polynomial | number") -> bool:
+        terms = self._coerce(other)
+        if terms is None:
+            return NotImplemented
+        return self.terms == {d: c for d, c in terms.items() if c != 0}
+
+    def __repr__(self) -> str:
+        return f"SparsePolynomial({self.terms})"
+
+    def __str__(self) -> str:
+        if not self.terms:
+            return "0"
+        parts = [format_poly(d, c, j == 0) for j, (d, c) in enumerate(self.terms.items())]
+        return "".join(parts)
+
+
+# Polynomials with fewer than one nonzero coefficient in this many
+# are stored sparse by dict2poly.
+_SPARSE_RATIO = 4
+
+
+def _is_sparse(nonzero: int, degree: int) -> bool:
+    return nonzero * _SPARSE_RATIO <= degree
+
+
+def list2poly(L: list[number]) -> Polynomial:
     """Return a polynomial function with coefficient in L.
     The coefficient of highest-degree term is the first item in list.
+    Use Polynomial.to_sparse or dict2poly for sparse polynomials.
 
     Parameters
     ----------
     L : list of integer or float
     """
-    if len(L) == 0:
+    return Polynomial(L)
+
+
+def dict2poly(D: dict[int, number]) -> Polynomial | SparsePolynomial:
+    """Return a polynomial function with the coefficient D[d] of degree d.
+
+    A dense Polynomial is returned unless most coefficients are zero.
+    """
+    p = SparsePolynomial(D)
+    if _is_sparse(len(p.terms), p.degree):
+        return p
+    return Polynomial(p.to_list())
+
+
+def _check_poly(P: list[number]) -> None:
+    if len(P) == 0:
         raise ValueError("the list cannot be empty")
-        
-    def p(x: number) -> float:
-        deg = len(L) - 1 # the degree of polynomial
-        y = 0.0
-        for j, coef in enumerate(L):
-            y += x**(deg-j) * coef
-        return y
-    return p
+
+
+def _strip(P: list[number]) -> list[number]:
+    """Remove the leading zero coefficients, keeping at least one."""
+    j = 0
+    while j < len(P) - 1 and P[j] == 0:
+        j += 1
+    return P[j:]
+
+
+def poly_add(P: list[number], Q: list[number]) -> list[number]:
+    """Return the coefficients of P + Q, highest-degree term first."""
+    _check_poly(P)
+    _check_poly(Q)
+    if len(P) < len(Q):
+        P, Q = Q, P
+    k = len(P) - len(Q)
+    return _strip(P[:k] + [a + b for a, b in zip(P[k:], Q)])
+
+
+def poly_sub(P: list[number], Q: list[number]) -> list[number]:
+    """Return the coefficients of P - Q, highest-degree term first."""
+    _check_poly(Q)
+    return poly_add(P, [-b for b in Q])
+
+
+def _schoolbook(a: list, b: list) -> list:
+    """Multiply coefficient lists, lowest-degree term first."""
+    c = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x != 0:
+            for j, y in enumerate(b):
+                c[i+j] += x * y
+    return c
+
+
+def _add_at(c: list, a: list, shift: int) -> None:
+    """Add a to c from index shift, lowest-degree term first."""
+    for j, x in enumerate(a):
+        c[shift + j] += x
+
+
+def _karatsuba(a: list, b: list, threshold: int) -> list:
+    """Multiply coefficient lists, lowest-degree term first."""
+    if len(a) < len(b):
+        a, b = b, a
+    n = len(b)
+    if n <= threshold:
+        return _schoolbook(a, b)
+
+    c = [0] * (len(a) + n - 1)
+    if len(a) > n:
+        # cut a into pieces of the length of b
+        for i in range(0, len(a), n):
+            _add_at(c, _karatsuba(a[i:i+n], b, threshold), i)
+        return c
+
+    m = n // 2
+    a0, a1, b0, b1 = a[:m], a[m:], b[:m], b[m:]
+    z0 = _karatsuba(a0, b0, threshold)
+    z2 = _karatsuba(a1, b1, threshold)
+    z1 = _karatsuba([x + y for x, y in zip(a1, a0 + [0])],
+        [x + y for x, y in zip(b1, b0 + [0])], threshold)
+    for j, x in enumerate(z0):
+        z1[j] -= x
+    for j, x in enumerate(z2):
+        z1[j] -= x
+    _add_at(c, z0, 0)
+    _add_at(c, z1, m)
+    _add_at(c, z2, 2*m)
+    return c
+
+
+# Products of more bits are computed with decimal, whose
+# multiplication uses a number-theoretic transform on large operands.
+_DECIMAL_PRODUCT_BITS = 1 << 18
+_DECIMAL_CONTEXT = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX)
+
+
+def _kronecker(a: list[int], b: list[int]) -> list[int]:
+    """Multiply integer coefficient lists, lowest-degree term first,
+    by a single product of big numbers.
+
+    Each list is packed into the number a(B) for a power B of 2, or
+    of 10 for large products, with B/2 larger than every coefficient
+    of the product. The product is read back as digits in [-B/2, B/2).
+    Coefficients too long for int/str conversion are always packed in
+    powers of 2.
+    """
+    bound = max(map(abs, a)) * max(map(abs, b)) * min(len(a), len(b))
+    n = len(a) + len(b) - 1
+    # at least the number of decimal digits of 2*bound
+    width = (2*bound).bit_length() * 30103 // 100000 + 1
+    limit = sys.get_int_max_str_digits()
+
+    if bound.bit_length() * n < _DECIMAL_PRODUCT_BITS or 0 < limit < 2*width:
+        size = bound.bit_length() // 8 + 1 # bytes per coefficient
+        zero = bytes(size)
+        def pack(a: list[int]) -> int:
+            positive = b"".join(x.to_bytes(size, "little") if x > 0 else zero for x in a)
+            negative = b"".join((-x).to_bytes(size, "little") if x < 0 else zero for x in a)
+            return int.from_bytes(positive, "little") - int.from_bytes(negative, "little")
+
+        product = pack(a) * pack(b)
+        data = abs(product).to_bytes(n * size, "little")
+        digits = [int.from_bytes(data[j:j+size], "little") for j in range(0, len(data), size)]
+        full = 1 << (8*size)
+    else:
+        zero = "0" * width
+        ctx = _DECIMAL_CONTEXT
+        def pack(a: list[int]) -> decimal.Decimal:
+            positive = "".join(f"{x:0{width}d}" if x > 0 else zero for x in reversed(a))
+            negative = "".join(f"{-x:0{width}d}" if x < 0 else zero for x in reversed(a))
+            return ctx.subtract(ctx.create_decimal(positive), ctx.create_decimal(negative))
+
+        product = ctx.multiply(pack(a), pack(b))
+        data = format(product.copy_abs(), "f").rjust(n * width, "0")
+        digits = [int(data[j-width:j]) for j in range(len(data), 0, -width)]
+        full = 10**width
+
+    sign = -1 if product < 0 else 1
+    half = full // 2
+    c = []
+    carry = 0
+    for x in digits:
+        x += carry
+        carry = x >= half
+        c.append(sign * (x - full if carry else x))
+    return c
+
+
+def poly_mul(P: list[number], Q: list[number], threshold: int = 32) -> list[number]:
+    """Return the coefficients of P * Q, highest-degree term first.
+
+    Parameters
+    ----------
+    P, Q : list of integer or float
+    threshold : int, default=32
+        Karatsuba's method is used when both P and Q have more than
+        threshold coefficients, and schoolbook multiplication otherwise.
+
+    Notes
+    -----
+    Integer coefficients are multiplied by Kronecker substitution, so
+    the work is done by a single multiplication of big integers.
+    """
+    _check_poly(P)
+    _check_poly(Q)
+    a, b = P[::-1], Q[::-1]
+    if all(type(x) is int for x in a + b):
+        if not any(a) or not any(b):
+            return [0]
+        c = _kronecker(a, b)
+    else:
+        c = _karatsuba(a, b, max(threshold, 1))
+    return _strip(c[::-1])
+
+
+def poly_divmod(P: list[number], D: list[number]) -> tuple[list[number], list[number]]:
+    """Divide P by D and return the coefficients of the quotient and
+    the remainder, highest-degree term first.
+
+    Integer quotients stay integers when the leading coefficient of D
+    divides them, and are computed with / otherwise.
+    """
+    _check_poly(P)
+    D = _strip(D)
+    if D[0] == 0:
+        raise ZeroDivisionError("division by the zero polynomial")
+    P = _strip(P)
+    if len(P) < len(D):
+        return [0], P
+
+    lead = D[0]
+    R = list(P)
+    Q = []
+    for j in range(len(P) - len(D) + 1):
+        c = R[j]
+        if type(c) is int and type(lead) is int and c % lead == 0:
+            q = c // lead
+        else:
+            q = c / lead
+        Q.append(q)
+        if q != 0:
+            for k in range(1, len(D)):
+                R[j+k] -= q * D[k]
+    return Q, _strip(R[len(Q):] or [0])
+
+
+def poly_compose(P: list[number], Q: list[number]) -> list[number]:
+    """Return the coefficients of P(Q(x)), highest-degree term first,
+    by Horner's rule with poly_mul.
+    """
+    _check_poly(P)
+    _check_poly(Q)
+    R = [P[0]]
+    for c in P[1:]:
+        R = poly_add(poly_mul(R, Q), [c])
+    return R
+
+
+def poly_derivative(P: list[number]) -> list[number]:
+    """Return the coefficients of the derivative of P,
+    highest-degree term first.
+    """
+    _check_poly(P)
+    deg = len(P) - 1
+    if deg == 0:
+        return [0]
+    return _strip([c * (deg - j) for j, c in enumerate(P[:-1])])
 
 
 def format_poly(deg: int, coef: number, leading: bool = False) -> str:
@@ -77,43 +522,68 @@ def format_poly(deg: int, coef: number, leading: bool = False) -> str:
 def list2polystr(L_: list) -> str:
     """Return a string representing polynomial function with coefficient in L_.
     The coefficient of highest-degree term is the first item in list.
+    Only the nonzero terms are formatted.
 
     Parameters
     ----------
     L_ : list of integer or float
     """
-    L = L_.copy()
-    
-    if len(L) == 0:
+    if len(L_) == 0:
         return ''
-    if len(L) == 1:
-        return str(L[0])
-    
-    deg = len(L) - 1
-    L[0] = format_poly(deg, L[0], True)
-    for j in range(1, deg+1):
-        L[j] = format_poly(deg-j, L[j])
+    if len(L_) == 1:
+        return str(L_[0])
+
+    deg = len(L_) - 1
+    parts = [format_poly(deg, L_[0], True)]
+    parts.extend(format_poly(deg-j, c) for j, c in enumerate(L_[1:], 1) if c != 0)
+    return ''.join(parts)
 
-    return ''.join(L)
+
+@lru_cache(maxsize=16)
+def _chebyshev_coef(n: int) -> tuple[int, ...]:
+    # T_n = sum of c_k x^(n-2k) with c_0 = 2^(n-1) and
+    # c_(k+1) / c_k = -(n-2k)(n-2k-1) / (4(k+1)(n-k-1))
+    coefs = [0] * (n + 1)
+    c = coefs[0] = 1 << (n - 1)
+    for k in range(n // 2):
+        c = -c * (n-2*k) * (n-2*k-1) // (4 * (k+1) * (n-k-1))
+        coefs[2*k + 2] = c
+    return tuple(coefs)
 
 
 def chebyshev_coef(n: int) -> list:
-    """Return a list containing coefficients of chebyshev polynomial of degree n."""
+    """Return a list containing coefficients of chebyshev polynomial of degree n.
+
+    The coefficients are computed from the explicit formula, each from
+    the previous one, and the 16 most recent degrees are cached.
+    """
     if n < 0:
         raise ValueError("argument must be nonnegative integer")
     if n == 0:
         return [1]
-        
-    T0 = [1]
-    T1 = [1, 0]
-    for j in range(2, n+1):
-        T2 = [2*a for a in T1]
-        T2.append(0)
-        for k in range(j-1):
-            T2[2+k] -= T0[k]
-        T0 = T1.copy()
-        T1 = T2.copy()
-    return T1
+    return list(_chebyshev_coef(n))
+
+
+def chebyshev_polys(n: int) -> Iterator[list[int]]:
+    """Yield the coefficient lists of the chebyshev polynomials
+    of degree 0, 1, ..., n by the three-term recurrence.
+
+    The yielded lists are used for the next terms, so they must
+    not be modified while iterating.
+    """
+    if n < 0:
+        raise ValueError("argument must be nonnegative integer")
+
+    T0, T1 = [1], [1, 0]
+    yield T0
+    for j in range(1, n + 1):
+        if j > 1:
+            T2 = [2*a for a in T1]
+            T2.append(0)
+            for k, a in enumerate(T0, 2):
+                T2[k] -= a
+            T0, T1 = T1, T2
+        yield T1
 
 
 def chebyshev_zeros(n: int) -> list[float]:
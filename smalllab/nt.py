@@ -1,28 +1,111 @@
 """This module contains functions related to number theory.
 """
 
-from math import sqrt, isqrt
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from collections import OrderedDict, deque, namedtuple
+from functools import lru_cache
+from heapq import merge
+from io import TextIOBase
+from itertools import accumulate, compress
+from math import sqrt, isqrt, gcd as _gcd
+import os
+import time
 
 number = int | float
 
+# Number of odd integers sieved at once by the segmented sieve.
+_SEGMENT_SIZE = 1 << 17
+
+
+def _square_flags(m: int) -> bytes:
+    """Return the flags of the quadratic residues modulo m."""
+    squares = {x*x % m for x in range(m)}
+    return bytes(r in squares for r in range(m))
+
+
+# Only 12/64, 16/63, 21/65 and 6/11 of the residues are squares,
+# so a non-square passes all four tests with probability below 1%.
+_SQUARES_MOD_64 = _square_flags(64)
+_SQUARES_MOD_63 = _square_flags(63)
+_SQUARES_MOD_65 = _square_flags(65)
+_SQUARES_MOD_11 = _square_flags(11)
+
 
 def is_square(n: number) -> bool:
-    """Check if a number is a perfect square."""
+    """Check if a number is a perfect square.
+
+    Most non-squares are rejected by their residues modulo
+    64, 63, 65 and 11 before the integer square root is computed.
+    """
     if n < 0:
         return False        
-    if n != int(n):
+    if type(n) is not int:
+        if n != int(n):
+            return False
+        n = int(n)
+    if not _SQUARES_MOD_64[n & 63]:
+        return False
+    r = n % 45045 # 63 * 65 * 11
+    if not (_SQUARES_MOD_63[r % 63] and _SQUARES_MOD_65[r % 65] and _SQUARES_MOD_11[r % 11]):
         return False
-    return n == isqrt(int(n)) ** 2
+    return n == isqrt(n) ** 2
+
+
+def squares_in(L: Iterable[number]) -> list[number]:
+    """Return the perfect squares in an iterable L, in order."""
+    mod64, mod63, mod65, mod11 = _SQUARES_MOD_64, _SQUARES_MOD_63, _SQUARES_MOD_65, _SQUARES_MOD_11
+    squares = []
+    for n in L:
+        if type(n) is not int:
+            if is_square(n):
+                squares.append(n)
+        elif n >= 0 and mod64[n & 63]:
+            r = n % 45045
+            if mod63[r % 63] and mod65[r % 65] and mod11[r % 11] and n == isqrt(n) ** 2:
+                squares.append(n)
+    return squares
 
 
 def gcd(a: int, b: int) -> int:
-    """Compute the gcd of two integers using Euclidean algorithm."""
+    """Compute the gcd of two integers.
+
+    The computation is done by math.gcd, which uses Euclid's algorithm
+    for small integers and Lehmer's algorithm for large ones.
+    """
     if not ( isinstance(a, int) and isinstance(b, int) ):
         raise ValueError("the arguments must be integers")
-    
-    while b:
-        a, b = b, a % b
-    return abs(a)
+    return _gcd(a, b)
+
+
+def batch_gcd(values: list[int], m: int) -> list[int]:
+    """Compute gcd(v, m) for every v in values.
+
+    m is reduced modulo the products of a product tree of values,
+    so each gcd at the leaves only involves numbers of the size of v.
+    This pays off when m is much larger than the values.
+    """
+    if not ( all(isinstance(v, int) for v in values) and isinstance(m, int) ):
+        raise ValueError("the arguments must be integers")
+
+    m = abs(m)
+    nonzero = [abs(v) for v in values if v != 0]
+    if not nonzero:
+        return [m for v in values]
+
+    tree = [nonzero]
+    while len(tree[-1]) > 1:
+        L = tree[-1]
+        tree.append([L[j] * L[j+1] for j in range(0, len(L) - 1, 2)])
+        if len(L) % 2:
+            tree[-1].append(L[-1])
+
+    remainders = [m % tree[-1][0]]
+    for L in reversed(tree[:-1]):
+        remainders = [remainders[j // 2] % v for j, v in enumerate(L)]
+
+    G = iter(_gcd(v, r) for v, r in zip(nonzero, remainders))
+    return [next(G) if v != 0 else m for v in values]
 
 
 def is_coprime(a: int, b: int) -> bool:
@@ -30,26 +113,671 @@ def is_coprime(a: int, b: int) -> bool:
     return gcd(a, b) == 1
 
 
+def ext_gcd(a: int, b: int) -> tuple[int, int, int]:
+    """Find g = gcd(a, b) and x, y with a*x + b*y = g by the extended
+    Euclidean algorithm.
+    """
+    if not ( isinstance(a, int) and isinstance(b, int) ):
+        raise ValueError("the arguments must be integers")
+
+    x0, y0, x1, y1 = 1, 0, 0, 1
+    while b != 0:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1 = x1, x0 - q*x1
+        y0, y1 = y1, y0 - q*y1
+    if a < 0:
+        return -a, -x0, -y0
+    return a, x0, y0
+
+
+def mod_inverse(a: int, m: int) -> int:
+    """Find the inverse of a modulo m in [0, m).
+
+    The computation is done by the builtin pow(a, -1, m).
+    """
+    if not ( isinstance(a, int) and isinstance(m, int) ):
+        raise ValueError("the arguments must be integers")
+    if m < 1:
+        raise ValueError("the modulus must be positive")
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        raise ValueError(f"{a} is not invertible modulo {m}") from None
+
+
+def crt(residues: list[int], moduli: list[int]) -> tuple[int, int]:
+    """Solve x = r mod m for all the pairs of residues and moduli.
+
+    The moduli need not be coprime.
+
+    Returns
+    -------
+    x, M : int
+        M is the lcm of the moduli and 0 <= x < M; the solutions are
+        the integers congruent to x modulo M.
+
+    Raises
+    ------
+    ValueError
+        If the congruences are inconsistent.
+    """
+    if len(residues) != len(moduli):
+        raise ValueError("there must be as many residues as moduli")
+    if any(m < 1 for m in moduli):
+        raise ValueError("the moduli must be positive")
+
+    x, M = 0, 1
+    for r, m in zip(residues, moduli):
+        g = _gcd(M, m)
+        if (r - x) % g != 0:
+            raise ValueError("the congruences are inconsistent")
+        m_g = m // g
+        t = (r - x) // g * pow(M // g, -1, m_g) % m_g
+        x += M * t
+        M *= m_g
+    return x % M, M
+
+
+def batch_inverse(values: list[int], m: int) -> list[int]:
+    """Find the inverses modulo m of all the values.
+
+    Montgomery's trick: the prefix products are inverted by a single
+    modular inversion and 3(n-1) multiplications in total.
+
+    Raises
+    ------
+    ValueError
+        If a value is not invertible modulo m.
+    """
+    if m < 1:
+        raise ValueError("the modulus must be positive")
+    if not values:
+        return []
+
+    prefix = [values[0] % m]
+    for a in values[1:]:
+        prefix.append(prefix[-1] * a % m)
+    if _gcd(prefix[-1], m) != 1:
+        a = next(a for a in values if _gcd(a, m) != 1)
+        raise ValueError(f"{a} is not invertible modulo {m}")
+
+    inverses = [0] * len(values)
+    inv = pow(prefix[-1], -1, m)
+    for j in range(len(values) - 1, 0, -1):
+        inverses[j] = inv * prefix[j-1] % m
+        inv = inv * values[j] % m
+    inverses[0] = inv
+    return inverses
+
+
+def jacobi(a: int, n: int) -> int:
+    """Compute the Jacobi symbol (a/n) for an odd positive integer n."""
+    if not ( isinstance(a, int) and isinstance(n, int) ):
+        raise TypeError("the arguments must be integers")
+    if n <= 0 or n % 2 == 0:
+        raise ValueError("n must be an odd positive integer")
+
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+# Bounds below which Miller-Rabin with the first k primes as bases
+# is deterministic, as pairs (bound, k).
+_MILLER_RABIN_BOUNDS = (
+    (2047, 1),
+    (1373653, 2),
+    (25326001, 3),
+    (3215031751, 4),
+    (2152302898747, 5),
+    (3474749660383, 6),
+    (341550071728321, 7),
+    (3825123056546413051, 9),
+    (318665857834031151167461, 12),
+    (3317044064679887385961981, 13),
+)
+_MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def _is_strong_prp(n: int, a: int) -> bool:
+    """Check if an odd n > 2 is a strong probable prime to base a."""
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    x = power_mod(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def _is_strong_lucas_prp(n: int) -> bool:
+    """Check if an odd n > 2, which is not a square, is a strong Lucas
+    probable prime with the parameters chosen by Selfridge's method A.
+    """
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P = 1
+    Q = (1 - D) // 4
+
+    d = n + 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    # Compute U_d, V_d and Q^d from the binary expansion of d.
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = (P * U + V) % n, (D * U + P * V) % n
+            if U % 2:
+                U += n
+            if V % 2:
+                V += n
+            U, V = U // 2, V // 2
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+
 def is_prime(n: int) -> bool:
-    """Check if a number is a prime."""
+    """Check if a number is a prime.
+
+    After trial division by small primes, the test is deterministic
+    Miller-Rabin for n < 3.3*10^24 and the Baillie-PSW test above.
+    """
     if not isinstance(n, int):
         raise TypeError("the argument must be an integer")
 
     if n <= 1:
         return False
-    if n == 2 or n == 3:
-        return True
-    if n % 2 == 0 or n % 3 == 0:
+    for p in _SMALL_PRIMES[:25]:
+        if n % p == 0:
+            return n == p
+        if p * p > n:
+            return True
+
+    for bound, k in _MILLER_RABIN_BOUNDS:
+        if n < bound:
+            return all(_is_strong_prp(n, a) for a in _MILLER_RABIN_BASES[:k])
+
+    if is_square(n):
         return False
-        
-    j = 5
-    root = sqrt(n)
-    while j <= root:
-        if n % j == 0 or n % (j + 2) == 0:
-            return False
-        j += 6
-        
-    return True
+    return _is_strong_prp(n, 2) and _is_strong_lucas_prp(n)
+
+
+def _sieve_segment(start: int, count: int, base_primes: list[int]) -> bytearray:
+    """Sieve the odd numbers start, start+2, ..., start+2*(count-1).
+
+    The returned bytearray has 1 at index i if start+2*i is prime.
+    start must be odd and base_primes must contain, in increasing order,
+    every odd prime p with p*p < start+2*count.
+    """
+    flags = bytearray(b"\x01") * count
+    stop = start + 2*count
+    for p in base_primes:
+        m = p * p
+        if m >= stop:
+            break
+        if m < start:
+            # the first odd multiple of p which is >= start
+            m = -(-start // p) * p
+            if m % 2 == 0:
+                m += p
+        j = (m - start) // 2
+        flags[j::p] = bytes(len(range(j, count, p)))
+    if start == 1 and count > 0:
+        flags[0] = 0
+    return flags
+
+
+def _odd_primes_up_to(n: int) -> list[int]:
+    """Return the odd primes <= n, used as base primes of the segmented sieve."""
+    if n < 9:
+        return [p for p in (3, 5, 7) if p <= n]
+    base_primes = _odd_primes_up_to(isqrt(n))
+    flags = _sieve_segment(1, (n+1) // 2, base_primes)
+    return [2*j + 1 for j in compress(range(len(flags)), flags)]
+
+
+def _prime_segments(lo: int, hi: int, size: int = _SEGMENT_SIZE) -> Iterator[list[int]]:
+    """Yield the primes p with lo <= p < hi as increasing lists,
+    one list for each segment of size odd numbers.
+    """
+    if lo <= 2 < hi:
+        yield [2]
+    start = max(lo, 3) | 1
+    if start >= hi:
+        return
+
+    base_primes = _odd_primes_up_to(isqrt(hi - 1))
+    while start < hi:
+        count = min(size, (hi - start + 1) // 2)
+        flags = _sieve_segment(start, count, base_primes)
+        yield [start + 2*j for j in compress(range(count), flags)]
+        start += 2 * count
+
+
+def primes_between(lo: int, hi: int) -> list[int]:
+    """Return all primes p with lo <= p < hi in increasing order.
+
+    The interval is sieved in segments of odd numbers, so besides the
+    result only O(sqrt(hi)) memory is used for the base primes.
+    """
+    if not ( isinstance(lo, int) and isinstance(hi, int) ):
+        raise TypeError("the arguments must be integers")
+
+    primes = []
+    for segment in _prime_segments(lo, hi):
+        primes.extend(segment)
+    return primes
+
+
+def iter_primes(start: int = 2) -> Iterator[int]:
+    """Yield the primes >= start in increasing order, without end.
+
+    Segments of odd numbers are sieved one after another. The base
+    primes are recomputed, to twice the needed bound, only when a
+    segment needs more of them, so memory stays O(sqrt(p)) in the
+    largest prime p produced.
+    """
+    if not isinstance(start, int):
+        raise TypeError("the argument must be an integer")
+
+    if start <= 2:
+        yield 2
+    lo = max(start, 3) | 1
+    bound = 0
+    base_primes = []
+    while True:
+        stop = lo + 2*_SEGMENT_SIZE
+        if isqrt(stop - 1) > bound:
+            bound = max(isqrt(stop - 1), 2*bound)
+            base_primes = _odd_primes_up_to(bound)
+        flags = _sieve_segment(lo, _SEGMENT_SIZE, base_primes)
+        yield from (lo + 2*j for j in compress(range(_SEGMENT_SIZE), flags))
+        lo = stop
+
+
+@lru_cache(maxsize=8)
+def _base_primes(n: int) -> list[int]:
+    """Return the odd primes <= n, cached for the workers of the parallel sieve."""
+    return _odd_primes_up_to(n)
+
+
+def _sieve_shared(name: str, start: int, offset: int, count: int, bound: int) -> None:
+    """Sieve count odd numbers from start into the shared memory block
+    name at offset, with the base primes <= bound.
+    """
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        base_primes = _base_primes(bound)
+        for j in range(0, count, _SEGMENT_SIZE):
+            size = min(_SEGMENT_SIZE, count - j)
+            flags = _sieve_segment(start + 2*j, size, base_primes)
+            shm.buf[offset+j:offset+j+size] = flags
+    finally:
+        shm.close()
+
+
+def parallel_primes_between(lo: int, hi: int, workers: int | None = None) -> list[int]:
+    """Return all primes p with lo <= p < hi in increasing order,
+    sieving parts of the interval in parallel processes.
+
+    Parameters
+    ----------
+    lo, hi : int
+    workers : int or None, default=None
+        The number of processes, os.cpu_count() if None.
+
+    Notes
+    -----
+    The workers write the flags of their parts into one shared memory
+    block, so no result is pickled, and the primes are read from the
+    block in order afterwards. The result equals primes_between(lo, hi).
+    """
+    if not ( isinstance(lo, int) and isinstance(hi, int) ):
+        raise TypeError("the arguments must be integers")
+
+    primes = [2] if lo <= 2 < hi else []
+    start = max(lo, 3) | 1
+    if start >= hi:
+        return primes
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    total = (hi - start + 1) // 2 # number of odd numbers in [start, hi)
+    bound = isqrt(hi - 1)
+    # a few parts per worker, each a whole number of segments
+    size = max(1, -(-total // (4*workers) // _SEGMENT_SIZE)) * _SEGMENT_SIZE
+
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(create=True, size=total)
+    try:
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(_sieve_shared, shm.name, start + 2*j, j,
+                min(size, total - j), bound) for j in range(0, total, size)]
+            for future in futures:
+                future.result()
+        flags = shm.buf[:total]
+        primes.extend(start + 2*j for j in compress(range(total), flags))
+        flags.release()
+    finally:
+        shm.close()
+        shm.unlink()
+    return primes
+
+
+def primes_up_to(n: int) -> list[int]:
+    """Return all primes <= n in increasing order."""
+    if not isinstance(n, int):
+        raise TypeError("the argument must be an integer")
+    return primes_between(2, n+1)
+
+
+def _lucy_hedgehog(x: int, weighted: bool) -> int:
+    """Return the number of primes <= x, or their sum if weighted,
+    by the Lucy_Hedgehog method in O(x^(3/4)) time and O(sqrt(x)) memory.
+    """
+    if x < 2:
+        return 0
+    r = isqrt(x)
+    if weighted:
+        S = lambda v: v*(v+1)//2 - 1
+    else:
+        S = lambda v: v - 1
+
+    # small[v] = S(v) and large[i] = S(x // i), where S(v) starts as the
+    # count or sum of 2, ..., v and ends as the count or sum of primes <= v.
+    small = [0] + [S(v) for v in range(1, r+1)]
+    large = [0] + [S(x // i) for i in range(1, r+1)]
+    for p in range(2, r+1):
+        if small[p] == small[p-1]:
+            continue # p is not a prime
+        sp = small[p-1]
+        w = p if weighted else 1
+        p2 = p * p
+        last = min(r, x // p2)
+        mid = min(last, r // p)
+        large[1:mid+1] = [large[i] - w*(large[i*p] - sp) for i in range(1, mid+1)]
+        large[mid+1:last+1] = [large[i] - w*(small[x // (i*p)] - sp)
+            for i in range(mid+1, last+1)]
+        if p2 <= r:
+            small[p2:] = [small[v] - w*(small[v // p] - sp) for v in range(p2, r+1)]
+    return large[1]
+
+
+def prime_count(x: int) -> int:
+    """Count the primes <= x in O(x^(3/4)) time and O(sqrt(x)) memory."""
+    if not isinstance(x, int):
+        raise TypeError("the argument must be an integer")
+    return _lucy_hedgehog(x, False)
+
+
+def prime_sum(x: int) -> int:
+    """Find the sum of the primes <= x in O(x^(3/4)) time and O(sqrt(x)) memory."""
+    if not isinstance(x, int):
+        raise TypeError("the argument must be an integer")
+    return _lucy_hedgehog(x, True)
+
+
+# The residues coprime to 30. Bit k of byte b of a PrimeSet
+# tells whether 30*b + _WHEEL[k] is prime.
+_WHEEL = (1, 7, 11, 13, 17, 19, 23, 29)
+_WHEEL_BIT = tuple(_WHEEL.index(r) if r in _WHEEL else -1 for r in range(30))
+_BYTE_RESIDUES = tuple(tuple(r for k, r in enumerate(_WHEEL) if byte >> k & 1)
+    for byte in range(256))
+# masks of the bits of the residues <= r and > r, for r = 0, ..., 29
+_UP_TO_MASK = tuple(sum(1 << k for k, w in enumerate(_WHEEL) if w <= r) for r in range(30))
+_ABOVE_MASK = tuple(255 ^ mask for mask in _UP_TO_MASK)
+# number of bytes between two stored prefix counts
+_RANK_BLOCK = 1024
+_PRIME_SET_MAGIC = b"SMLPRIME"
+
+
+class PrimeSet:
+    """Set of the primes <= N as a bitmap of the integers coprime to 30,
+    one byte for every 30 integers.
+
+    Parameters
+    ----------
+    N : int
+        The largest integer covered by the set.
+
+    Notes
+    -----
+    Membership is a bit lookup. rank and select use prefix counts of
+    every 1024 bytes, computed on first use. A set written by save can
+    be loaded with load, which maps the file into memory instead of
+    reading it, so processes loading the same file share its pages.
+    """
+    __slots__ = ("limit", "_bits", "_counts", "_mmap")
+
+    def __init__(self, N: int):
+        if not isinstance(N, int):
+            raise TypeError("the argument must be an integer")
+        if N < 1:
+            raise ValueError("N must be positive")
+
+        size = N // 30 + 1
+        bits = bytearray(size)
+        base_primes = _odd_primes_up_to(isqrt(30 * size))
+        step = _SEGMENT_SIZE // 15
+        for b in range(0, size, step):
+            blocks = min(step, size - b)
+            flags = _sieve_segment(30*b + 1, 15*blocks, base_primes)
+            # gather the flags of each residue into its bit of the bytes
+            packed = 0
+            for k, r in enumerate(_WHEEL):
+                table = bytes([0, 1 << k]) + bytes(254)
+                packed |= int.from_bytes(flags[(r-1)//2::15].translate(table), "little")
+            bits[b:b+blocks] = packed.to_bytes(blocks, "little")
+        bits[-1] &= _UP_TO_MASK[N % 30]
+
+        self.limit = N
+        self._bits = bits
+        self._counts = None
+        self._mmap = None
+
+    def __contains__(self, n: int) -> bool:
+        if n > self.limit:
+            raise ValueError("n exceeds the limit of the set")
+        if n < 7:
+            return n in (2, 3, 5)
+        k = _WHEEL_BIT[n % 30]
+        return k >= 0 and self._bits[n // 30] >> k & 1 == 1
+
+    def __iter__(self) -> Iterator[int]:
+        for p in (2, 3, 5):
+            if p <= self.limit:
+                yield p
+        for b, byte in enumerate(self._bits):
+            if byte:
+                base = 30 * b
+                for r in _BYTE_RESIDUES[byte]:
+                    yield base + r
+
+    def __len__(self) -> int:
+        return self.rank(self.limit)
+
+    def next_prime(self, n: int) -> int:
+        """Return the smallest prime > n."""
+        for p in (2, 3, 5):
+            if n < p <= self.limit:
+                return p
+
+        bits = self._bits
+        b = max(n, 0) // 30
+        byte = bits[b] & _ABOVE_MASK[n % 30] if b < len(bits) else 0
+        while not byte:
+            b += 1
+            if b >= len(bits):
+                raise ValueError("there is no prime after n within the limit")
+            byte = bits[b]
+        return 30*b + _BYTE_RESIDUES[byte][0]
+
+    def prev_prime(self, n: int) -> int:
+        """Return the largest prime < n, for n <= N + 1."""
+        if n <= 2:
+            raise ValueError("there is no prime before n")
+        if n > self.limit + 1:
+            raise ValueError("n exceeds the limit of the set")
+        if n <= 7:
+            return max(p for p in (2, 3, 5) if p < n)
+
+        bits = self._bits
+        b = (n - 1) // 30
+        byte = bits[b] & _UP_TO_MASK[(n - 1) % 30]
+        while not byte:
+            b -= 1
+            if b < 0:
+                return 5
+            byte = bits[b]
+        return 30*b + _BYTE_RESIDUES[byte][-1]
+
+    def _prefix_counts(self) -> array:
+        """Return the number of primes > 5 in the first 1024*i bytes at index i."""
+        if self._counts is None:
+            bits = self._bits
+            counts = array("Q", [0])
+            for j in range(0, len(bits), _RANK_BLOCK):
+                ones = int.from_bytes(bits[j:j+_RANK_BLOCK], "little").bit_count()
+                counts.append(counts[-1] + ones)
+            self._counts = counts
+        return self._counts
+
+    def rank(self, n: int) -> int:
+        """Count the primes <= n, for n <= N."""
+        if n > self.limit:
+            raise ValueError("n exceeds the limit of the set")
+        if n < 7:
+            return sum(1 for p in (2, 3, 5) if p <= n)
+
+        b = n // 30
+        j = b // _RANK_BLOCK
+        count = self._prefix_counts()[j]
+        count += int.from_bytes(self._bits[j*_RANK_BLOCK:b], "little").bit_count()
+        count += (self._bits[b] & _UP_TO_MASK[n % 30]).bit_count()
+        return count + 3
+
+    def select(self, k: int) -> int:
+        """Return the k-th smallest prime, starting from select(1) = 2."""
+        if k < 1:
+            raise IndexError("k must be positive")
+        small = [p for p in (2, 3, 5) if p <= self.limit]
+        if k <= len(small):
+            return small[k-1]
+        k -= 3
+
+        counts = self._prefix_counts()
+        if k > counts[-1]:
+            raise IndexError("there are less than k primes in the set")
+        # the last block whose prefix count is less than k
+        lo, hi = 0, len(counts) - 1
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if counts[mid] < k:
+                lo = mid
+            else:
+                hi = mid
+        k -= counts[lo]
+        b = lo * _RANK_BLOCK
+        bits = self._bits
+        while True:
+            residues = _BYTE_RESIDUES[bits[b]]
+            if k <= len(residues):
+                return 30*b + residues[k-1]
+            k -= len(residues)
+            b += 1
+
+    def save(self, path: str) -> None:
+        """Write the set to a file which can be loaded with PrimeSet.load."""
+        with open(path, "wb") as f:
+            f.write(_PRIME_SET_MAGIC)
+            f.write(self.limit.to_bytes(8, "little"))
+            f.write(self._bits)
+
+    @classmethod
+    def load(cls, path: str, use_mmap: bool = True) -> "PrimeSet":
+        """Load a set written by save, mapping the file into memory
+        unless use_mmap is False.
+        """
+        with open(path, "rb") as f:
+            header = f.read(16)
+            if len(header) < 16 or header[:8] != _PRIME_SET_MAGIC:
+                raise ValueError("the file does not contain a PrimeSet")
+            limit = int.from_bytes(header[8:], "little")
+            if use_mmap:
+                import mmap
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                bits = memoryview(mm)[16:]
+            else:
+                mm = None
+                bits = bytearray(f.read())
+        if len(bits) != limit // 30 + 1:
+            if mm is not None:
+                bits.release()
+                mm.close()
+            raise ValueError("the file is truncated")
+
+        S = cls.__new__(cls)
+        S.limit = limit
+        S._bits = bits
+        S._counts = None
+        S._mmap = mm
+        return S
+
+    def close(self) -> None:
+        """Unmap the file of a set loaded with use_mmap."""
+        if self._mmap is not None:
+            self._bits.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "PrimeSet":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+# Primes below 1000, used for trial division.
+_SMALL_PRIMES = tuple(primes_up_to(1000))
 
 
 def smallest_prime_factor(n: int) -> int:
@@ -74,23 +802,81 @@ def smallest_prime_factor(n: int) -> int:
     return n
 
 
+def _pollard_brent(n: int) -> int:
+    """Find a nontrivial factor of an odd composite n
+    using Brent's variant of Pollard's rho method.
+    """
+    m = 128 # number of products accumulated before each gcd
+    c = 1
+    while True:
+        y, r, q, g = 2, 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y*y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y*y + c) % n
+                    q = q * abs(x - y) % n
+                g = _gcd(q, n)
+                k += m
+            r *= 2
+
+        if g == n:
+            # the batch overshot, so step back one term at a time
+            g = 1
+            while g == 1:
+                ys = (ys*ys + c) % n
+                g = _gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        c += 1
+
+
 def decompose(n: int) -> dict[int, int]:
     """Find the prime factorization of integer greater than 1 as a dictionary,
     with the primes as keys and their exponents as values.
+
+    Small prime factors are removed by trial division, the remaining
+    composite parts are split with Pollard-Brent rho. If a cache was
+    set by enable_factor_cache, it is used for n >= its min_n.
     """
     if n <= 1:
         raise ValueError("the number must be greater than 1")
-    
+
+    cache = _factor_cache
+    if cache is None or n < cache.min_n:
+        return _decompose(n)
+    D = cache.get(n)
+    if D is None:
+        D = _decompose(n)
+        cache.put(n, D)
+    return dict(D)
+
+
+def _decompose(n: int) -> dict[int, int]:
+    """Find the prime factorization of n > 1 without the cache."""
     D = {}
-    while n > 1:
-        p = smallest_prime_factor(n)
-        if p in D.keys():
-            D[p] += 1
+    for p in _SMALL_PRIMES:
+        if p * p > n:
+            break
+        while n % p == 0:
+            D[p] = D.get(p, 0) + 1
+            n //= p
+
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_prime(m):
+            D[m] = D.get(m, 0) + 1
         else:
-            D[p] = 1
-        n //= p
+            d = _pollard_brent(m)
+            stack.append(d)
+            stack.append(m // d)
     
-    return D
+    return dict(sorted(D.items()))
 
 
 def recompose(D: dict[int, int]) -> int:
@@ -101,6 +887,263 @@ def recompose(D: dict[int, int]) -> int:
     return n
 
 
+FactorCacheInfo = namedtuple(
+    "FactorCacheInfo", ["hits", "disk_hits", "misses", "size", "disk_size"])
+FactorCacheInfo.__doc__ = """Counters of a FactorCache."""
+
+
+class FactorCache:
+    """Cache of factorizations, with a bounded LRU dictionary in memory
+    in front of an optional sqlite3 database shared between processes.
+
+    Parameters
+    ----------
+    path : str or None, default=None
+        The database file. If None, only the memory tier is used.
+    maxsize : int, default=4096
+        The maximum number of factorizations kept in memory.
+    max_disk_entries : int, default=1000000
+        The maximum number of factorizations kept in the database.
+        The ones least recently written or read from the database
+        are removed first, in batches of max_disk_entries // 16.
+    min_n : int, default=10**12
+        Smaller numbers are factored faster than they are looked up,
+        so decompose does not cache them.
+
+    Notes
+    -----
+    Factorizations read from the database are verified before use,
+    and removed if they are wrong.
+    """
+
+    def __init__(self, path: str | None = None, maxsize: int = 4096,
+            max_disk_entries: int = 1000000, min_n: int = 10**12):
+        if maxsize < 0 or max_disk_entries < 1:
+            raise ValueError("the sizes must be positive")
+        self.maxsize = maxsize
+        self.max_disk_entries = max_disk_entries
+        self.min_n = min_n
+        self.hits = self.disk_hits = self.misses = 0
+        self._memory = OrderedDict()
+        self._db = None
+        if path is not None:
+            import sqlite3
+            self._db = sqlite3.connect(path, timeout=30)
+            with self._db:
+                self._db.execute("CREATE TABLE IF NOT EXISTS factorizations "
+                    "(n TEXT PRIMARY KEY, factors TEXT NOT NULL, used INTEGER NOT NULL)")
+                self._db.execute("CREATE INDEX IF NOT EXISTS factorizations_used "
+                    "ON factorizations (used)")
+            self._used, self._rows = self._db.execute(
+                "SELECT COALESCE(MAX(used), 0), COUNT(*) FROM factorizations").fetchone()
+
+    def _remember(self, n: int, D: dict[int, int]) -> None:
+        self._memory[n] = D
+        self._memory.move_to_end(n)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def _clock(self) -> int:
+        """Return a counter ordering the uses of database entries.
+
+        It is kept in memory and seeded from the database when opened
+        and at each eviction, so with several processes the order of
+        uses is only approximate.
+        """
+        self._used += 1
+        return self._used
+
+    def get(self, n: int) -> dict[int, int] | None:
+        """Return the cached factorization of n, or None."""
+        D = self._memory.get(n)
+        if D is not None:
+            self._memory.move_to_end(n)
+            self.hits += 1
+            return D
+
+        if self._db is not None:
+            key = format(n, "x")
+            row = self._db.execute("SELECT factors FROM factorizations WHERE n = ?",
+                (key,)).fetchone()
+            if row is not None:
+                D = {}
+                for term in row[0].split("*"):
+                    p, e = term.split("^")
+                    D[int(p, 16)] = int(e)
+                with self._db:
+                    if recompose(D) == n and all(map(is_prime, D)):
+                        self._db.execute("UPDATE factorizations SET used = ? WHERE n = ?",
+                            (self._clock(), key))
+                    else:
+                        self._db.execute("DELETE FROM factorizations WHERE n = ?", (key,))
+                        self._rows -= 1
+                        D = None
+            if D is not None:
+                self._remember(n, D)
+                self.disk_hits += 1
+                return D
+
+        self.misses += 1
+        return None
+
+    def put(self, n: int, D: dict[int, int]) -> None:
+        """Store the factorization D of n."""
+        D = dict(D)
+        self._remember(n, D)
+        if self._db is None:
+            return
+
+        factors = "*".join(f"{p:x}^{e}" for p, e in D.items())
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO factorizations VALUES (?, ?, ?)",
+                (format(n, "x"), factors, self._clock()))
+            # an upper bound, since a replaced row is counted again
+            self._rows += 1
+            if self._rows > self.max_disk_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries beyond max_disk_entries,
+        and 1/16 of max_disk_entries more, so this runs once per batch
+        of writes.
+        """
+        self._used, self._rows = self._db.execute(
+            "SELECT COALESCE(MAX(used), 0), COUNT(*) FROM factorizations").fetchone()
+        excess = self._rows - self.max_disk_entries
+        if excess > 0:
+            excess += self.max_disk_entries // 16
+            cursor = self._db.execute("DELETE FROM factorizations WHERE n IN "
+                "(SELECT n FROM factorizations ORDER BY used LIMIT ?)", (excess,))
+            self._rows -= cursor.rowcount
+
+    def _disk_size(self) -> int:
+        if self._db is None:
+            return 0
+        return self._db.execute("SELECT COUNT(*) FROM factorizations").fetchone()[0]
+
+    def info(self) -> FactorCacheInfo:
+        """Return the hit and miss counters and the sizes of both tiers."""
+        return FactorCacheInfo(self.hits, self.disk_hits, self.misses,
+            len(self._memory), self._disk_size())
+
+    def clear(self) -> None:
+        """Remove every entry of both tiers and reset the counters."""
+        self._memory.clear()
+        self.hits = self.disk_hits = self.misses = 0
+        if self._db is not None:
+            with self._db:
+                self._db.execute("DELETE FROM factorizations")
+            self._rows = 0
+
+    def close(self) -> None:
+        """Close the database."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+_factor_cache = None
+
+
+def enable_factor_cache(path: str | None = None, maxsize: int = 4096,
+        max_disk_entries: int = 1000000, min_n: int = 10**12) -> FactorCache:
+    """Make decompose, and so divisor_num, divisor_sum and totient,
+    use a FactorCache with the given parameters, and return it.
+    """
+    global _factor_cache
+    disable_factor_cache()
+    _factor_cache = FactorCache(path, maxsize, max_disk_entries, min_n)
+    return _factor_cache
+
+
+def disable_factor_cache() -> None:
+    """Stop using the factorization cache and close it."""
+    global _factor_cache
+    if _factor_cache is not None:
+        _factor_cache.close()
+        _factor_cache = None
+
+
+class SPFTable:
+    """Table of the smallest prime factors of 0, 1, ..., N,
+    for factorizing many integers <= N by table walks.
+
+    Parameters
+    ----------
+    N : int
+        The largest integer in the table, 1 <= N < 2^32.
+
+    Notes
+    -----
+    The table is an array('I') filled by marking the multiples of each
+    prime p <= sqrt(N) from p^2, largest p first, so the smallest prime
+    factor is written last. Each marking is a single slice assignment.
+    """
+    __slots__ = ("limit", "_spf")
+
+    def __init__(self, N: int):
+        if not isinstance(N, int):
+            raise TypeError("the argument must be an integer")
+        if N < 1 or N >= 2**32:
+            raise ValueError("N must be between 1 and 2^32 - 1")
+
+        spf = array("I", range(N + 1))
+        for p in reversed(primes_up_to(isqrt(N))):
+            spf[p*p::p] = array("I", [p]) * len(range(p*p, N+1, p))
+        self.limit = N
+        self._spf = spf
+
+    def __len__(self) -> int:
+        return self.limit + 1
+
+    def __getitem__(self, n: int) -> int:
+        """Return the smallest prime factor of n >= 2."""
+        if not 2 <= n <= self.limit:
+            raise IndexError("n must be between 2 and the table limit")
+        return self._spf[n]
+
+    def is_prime(self, n: int) -> bool:
+        """Check if n <= N is a prime."""
+        if not 0 <= n <= self.limit:
+            raise IndexError("n must be between 0 and the table limit")
+        return n >= 2 and self._spf[n] == n
+
+    def factor(self, n: int) -> dict[int, int]:
+        """Find the prime factorization of 2 <= n <= N in the same form
+        as decompose, in O(log n) steps.
+        """
+        if not 2 <= n <= self.limit:
+            raise ValueError("n must be between 2 and the table limit")
+
+        spf = self._spf
+        D = {}
+        while n > 1:
+            p = spf[n]
+            n //= p
+            k = 1
+            while spf[n] == p:
+                n //= p
+                k += 1
+            D[p] = k
+        return D
+
+    def factorizations(self, start: int = 2) -> Iterator[tuple[int, dict[int, int]]]:
+        """Yield the pairs (n, factor(n)) for start <= n <= N."""
+        spf = self._spf
+        for n in range(max(start, 2), self.limit + 1):
+            D = {}
+            m = n
+            while m > 1:
+                p = spf[m]
+                m //= p
+                k = 1
+                while spf[m] == p:
+                    m //= p
+                    k += 1
+                D[p] = k
+            yield n, D
+
+
 def divisor_num(n: int) -> int:
     """Find the number of positive divisors of n."""
     if n == 0:
@@ -133,6 +1176,36 @@ def divisor_sum(n: int) -> int:
     return sum
 
 
+def divisors(n: int, ordered: bool = False) -> Iterator[int]:
+    """Yield the positive divisors of n, built from decompose(n).
+
+    Parameters
+    ----------
+    n : int
+        A nonzero integer.
+    ordered : bool, default=False
+        Whether to yield the divisors in increasing order. The sorted
+        divisors of p^e * m are then merged from the sorted lists
+        p^i * (divisors of m), one prime at a time.
+    """
+    if n == 0:
+        raise ValueError("the number must be nonzero")
+
+    n = abs(n)
+    D = [1]
+    items = list(decompose(n).items()) if n > 1 else []
+    for j, (p, e) in enumerate(items):
+        powers = [p**i for i in range(e + 1)]
+        if not ordered:
+            D = [d * q for q in powers for d in D]
+        elif j < len(items) - 1:
+            D = list(merge(*([d * q for d in D] for q in powers)))
+        else:
+            yield from merge(*([d * q for d in D] for q in powers))
+            return
+    yield from D
+
+
 def is_perfect(n: int) -> bool:
     """Check if the sum of positive divisors of n equals 2*n."""
     return divisor_sum(n) == 2*n
@@ -152,42 +1225,848 @@ def totient(n: int) -> int:
     return sum
 
 
-def decimal2binary(n: int) -> str:
-    """Return a string consisting digits of binary expansion of n."""
+def multiplicative_range(N: int, f: Callable[[int, int], number],
+        typecode: str = "q") -> array | list:
+    """Compute the values of a multiplicative function at 0, 1, ..., N
+    in a single pass over the smallest-prime-factor table.
+
+    Parameters
+    ----------
+    N : int
+        The largest argument, 1 <= N < 2^32.
+    f : Callable
+        f(p, e) is the value of the function at the prime power p^e.
+        It is called once for each prime power <= N.
+    typecode : str, default="q"
+        Typecode of the returned array. If a value does not fit,
+        the result falls back to a list of Python numbers.
+
+    Returns
+    -------
+    array or list
+        Entry n is the value at n, entry 0 is 0.
+    """
+    spf = SPFTable(N)._spf
+    values = array(typecode, [0]) * (N + 1)
+    values[1] = 1
+    low = array("I", [0]) * (N + 1) # the power of spf[n] dividing n
+    exponents = {} # exponents e >= 2 of prime powers p^e
+    for n in range(2, N + 1):
+        p = spf[n]
+        m = n // p
+        q = low[m] * p if spf[m] == p else p
+        low[n] = q
+        if q == n:
+            if m == 1:
+                v = f(p, 1)
+            else:
+                e = exponents.get(m, 1) + 1
+                exponents[n] = e
+                v = f(p, e)
+        else:
+            v = values[q] * values[n // q]
+
+        try:
+            values[n] = v
+        except (OverflowError, TypeError):
+            values = list(values)
+            values[n] = v
+    return values
+
+
+def totient_range(N: int) -> array | list:
+    """Return the values of totient at 0, 1, ..., N, with 0 at index 0."""
+    return multiplicative_range(N, lambda p, e: p**(e-1) * (p-1), "I")
+
+
+def divisor_num_range(N: int) -> array | list:
+    """Return the values of divisor_num at 0, 1, ..., N, with 0 at index 0."""
+    return multiplicative_range(N, lambda p, e: e + 1, "I")
+
+
+def divisor_sum_range(N: int) -> array | list:
+    """Return the values of divisor_sum at 0, 1, ..., N, with 0 at index 0."""
+    return multiplicative_range(N, lambda p, e: (p**(e+1) - 1) // (p-1), "q")
+
+
+def divisor_lists(N: int) -> tuple[array, array]:
+    """Compute the sorted divisors of every n <= N in flat arrays.
+
+    Parameters
+    ----------
+    N : int
+        The largest integer, 1 <= N < 2^32.
+
+    Returns
+    -------
+    offsets : array('Q')
+        N + 2 offsets into values.
+    values : array('I')
+        The divisors of n are values[offsets[n]:offsets[n+1]],
+        in increasing order; there are none for n = 0.
+
+    Notes
+    -----
+    The lengths come from divisor_num_range. The harmonic sieve runs
+    over d <= sqrt(N) only, and writes d and m // d for each multiple
+    m >= d^2 of d, from the front and the back of the slot of m.
+    """
+    offsets = array("Q", accumulate(divisor_num_range(N), initial=0))
+    values = array("I", [0]) * offsets[-1]
+    filled = array("I", [0]) * (N + 1) # divisors <= sqrt(m) written
+    for d in range(1, isqrt(N) + 1):
+        m = d*d
+        values[offsets[m] + filled[m]] = d
+        filled[m] += 1
+        k = d
+        for m in range(m + d, N + 1, d):
+            k += 1
+            c = filled[m]
+            values[offsets[m] + c] = d
+            values[offsets[m+1] + ~c] = k
+            filled[m] = c + 1
+    return offsets, values
+
+
+AliquotResult = namedtuple(
+    "AliquotResult", ["start", "kind", "preperiod", "period", "elapsed"])
+AliquotResult.__doc__ = """The outcome of following the aliquot sequence of start.
+
+kind is "terminating" if the sequence reaches 1, "perfect",
+"amicable" or "sociable" if it enters a cycle of period 1, 2 or more,
+and "open" if it was stopped by the step or value limit.
+preperiod is the index of the term 1 or of the first term in the
+cycle, or the number of steps taken if open."""
+
+
+class AliquotEngine:
+    """Follow aliquot sequences n, s(n), s(s(n)), ... with
+    s(n) = divisor_sum(n) - n shared between sequences.
+
+    Parameters
+    ----------
+    table_limit : int, default=10**6
+        s(n) is read from divisor_sum_range for n <= table_limit.
+    max_steps : int, default=1000
+        Sequences longer than this are reported open.
+    max_value : int, default=10**15
+        Sequences with a term above this are reported open.
+    cache_path : str or None, default=None
+        Larger n are factorized through a FactorCache, stored in
+        this SQLite database if given.
+    cache_size : int, default=65536
+        Number of factorizations kept in memory.
+
+    Notes
+    -----
+    Cycles are found by Brent's method, which stores no terms. Its
+    second pass recomputes terms, which are then served by the caches.
+    """
+
+    def __init__(self, table_limit: int = 10**6, max_steps: int = 1000,
+            max_value: int = 10**15, cache_path: str | None = None,
+            cache_size: int = 65536):
+        self._args = (table_limit, max_steps, max_value, cache_path, cache_size)
+        self.table_limit = table_limit
+        self.max_steps = max_steps
+        self.max_value = max_value
+        self._table = divisor_sum_range(table_limit)
+        self._cache = FactorCache(cache_path, cache_size, min_n=0)
+
+    def s(self, n: int) -> int:
+        """Return the sum of the proper divisors of n >= 1."""
+        if n <= self.table_limit:
+            return self._table[n] - n
+        D = self._cache.get(n)
+        if D is None:
+            D = decompose(n)
+            self._cache.put(n, D)
+        sum = 1
+        for p, e in D.items():
+            sum *= (p**(e+1) - 1) // (p - 1)
+        return sum - n
+
+    def follow(self, n: int) -> AliquotResult:
+        """Follow the aliquot sequence of n >= 1."""
+        if not isinstance(n, int):
+            raise TypeError("the argument must be an integer")
+        if n < 1:
+            raise ValueError("the argument must be positive integer")
+
+        t0 = time.perf_counter()
+        def result(kind: str, preperiod: int, period: int = 0) -> AliquotResult:
+            return AliquotResult(n, kind, preperiod, period, time.perf_counter() - t0)
+
+        # Brent's method: the tortoise waits at step 2^k - 1 while the
+        # hare runs up to 2^(k+1) - 1 steps, until they meet.
+        tortoise, hare = n, n
+        steps, power, period = 0, 1, 0
+        while True:
+            if hare == 1:
+                return result("terminating", steps)
+            if steps >= self.max_steps or hare > self.max_value:
+                return result("open", steps)
+            hare = self.s(hare)
+            steps += 1
+            period += 1
+            if hare == tortoise:
+                break
+            if period == power:
+                tortoise = hare
+                power *= 2
+                period = 0
+
+        # the first term of the cycle is where a tortoise from n
+        # meets a hare starting period steps ahead
+        tortoise = hare = n
+        for _ in range(period):
+            hare = self.s(hare)
+        preperiod = 0
+        while tortoise != hare:
+            tortoise = self.s(tortoise)
+            hare = self.s(hare)
+            preperiod += 1
+        kind = {1: "perfect", 2: "amicable"}.get(period, "sociable")
+        return result(kind, preperiod, period)
+
+    def sweep(self, starts: Iterable[int], workers: int | None = None) -> Iterator[AliquotResult]:
+        """Yield follow(n) for each n of starts, in order.
+
+        workers is the number of processes, os.cpu_count() if None;
+        each builds its own engine with the same parameters.
+        With 1, everything runs in the calling process.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers == 1:
+            for n in starts:
+                yield self.follow(n)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(workers, initializer=_start_aliquot_worker,
+                initargs=self._args) as executor:
+            yield from executor.map(_aliquot_in_worker, starts, chunksize=64)
+
+    def close(self) -> None:
+        """Close the factorization cache."""
+        self._cache.close()
+
+
+_aliquot_engine = None
+
+
+def _start_aliquot_worker(*args) -> None:
+    global _aliquot_engine, _factor_cache
+    # a forked worker must not use the sqlite3 connection of the parent's
+    # cache, and closing it here would close the parent's handle
+    _factor_cache = None
+    _aliquot_engine = AliquotEngine(*args)
+
+
+def _aliquot_in_worker(n: int) -> AliquotResult:
+    return _aliquot_engine.follow(n)
+
+
+def _checkpoint_checksum(state: dict) -> str:
+    import hashlib
+    import json
+    data = json.dumps(state, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class _Checkpoint:
+    """The progress of a scan, saved as a small JSON state file at path
+    and the results appended to path + ".results", one per line.
+
+    The state records the length and the sha256 of the results file when
+    it was written. Saving appends only the new results, and loading
+    truncates whatever a crash left after that length.
+    """
+
+    def __init__(self, path: str, params: dict):
+        import hashlib
+        self.path = path
+        self.params = params
+        self._digest = hashlib.sha256()
+        self._length = 0
+        self._count = 0
+
+    def _corrupted(self) -> ValueError:
+        return ValueError(f"the checkpoint {self.path} is corrupted")
+
+    def load(self) -> tuple[int, list[int]]:
+        """Return the position and the results saved at path."""
+        import json
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            checksum = state.pop("checksum")
+        except (ValueError, KeyError, AttributeError, TypeError) as e:
+            raise self._corrupted() from e
+        if checksum != _checkpoint_checksum(state):
+            raise self._corrupted()
+        if any(state.get(key) != value for key, value in self.params.items()):
+            raise ValueError(f"the checkpoint {self.path} belongs to another scan")
+
+        try:
+            with open(self.path + ".results", "r+b") as f:
+                data = f.read(state["length"])
+                self._digest.update(data)
+                if len(data) != state["length"] or self._digest.hexdigest() != state["digest"]:
+                    raise self._corrupted()
+                f.truncate(state["length"])
+        except FileNotFoundError as e:
+            raise self._corrupted() from e
+        results = [int(n) for n in data.split()]
+        self._length, self._count = len(data), len(results)
+        return state["position"], results
+
+    def clear(self) -> None:
+        """Empty the results file for a new scan."""
+        open(self.path + ".results", "wb").close()
+
+    def save(self, position: int, results: list[int]) -> None:
+        """Append the results not saved yet, then write the state to a
+        temporary file and move it over path, so a crash while saving
+        leaves the previous checkpoint intact.
+        """
+        import json
+        data = "".join(f"{n}\n" for n in results[self._count:]).encode()
+        with open(self.path + ".results", "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._digest.update(data)
+        self._length += len(data)
+        self._count = len(results)
+
+        state = dict(self.params, position=position, length=self._length,
+            digest=self._digest.hexdigest())
+        state["checksum"] = _checkpoint_checksum(state)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+
+def scan_range(predicate: Callable[[int], bool], lo: int, hi: int,
+        checkpoint: str | None = None, chunk_size: int = 1 << 16,
+        interval: float = 60.0, key: str | None = None) -> list[int]:
+    """Return the n with lo <= n < hi for which predicate(n) is true,
+    saving the progress so an interrupted scan can be resumed.
+
+    Parameters
+    ----------
+    predicate : Callable
+        A function of one integer, such as is_prime or is_perfect.
+    lo, hi : int
+    checkpoint : str or None, default=None
+        Path of the JSON checkpoint file; the results found so far are
+        kept in the file path + ".results". If it exists, the scan resumes
+        after its last completed chunk. The finished scan is saved too,
+        so running it again returns at once.
+    chunk_size : int, default=1 << 16
+        Number of integers tested between two possible saves.
+    interval : float, default=60.0
+        Minimum number of seconds between two saves.
+    key : str or None, default=None
+        The name of the predicate stored in the checkpoint. If None, the
+        qualified name of the predicate is used, or its repr if it has
+        none, e.g. for a functools.partial.
+
+    Raises
+    ------
+    ValueError
+        If the checkpoint was written by a scan with other arguments,
+        or its checksum does not match, or if it should be resumed
+        without a key for a predicate whose name does not identify it,
+        such as a lambda, a local function or a partial.
+    """
+    if not ( isinstance(lo, int) and isinstance(hi, int) ):
+        raise TypeError("the arguments must be integers")
+    if chunk_size < 1:
+        raise ValueError("the chunk size must be positive")
+
+    if key is None:
+        qualname = getattr(predicate, "__qualname__", None)
+        if qualname is None:
+            key = repr(predicate)
+        else:
+            key = f"{getattr(predicate, '__module__', None)}.{qualname}"
+        # all lambdas share a name, and reprs may hold addresses
+        ambiguous = any(mark in key for mark in ("<lambda>", "<locals>", " at 0x"))
+    else:
+        ambiguous = False
+
+    params = {"predicate": key, "lo": lo, "hi": hi, "chunk_size": chunk_size}
+    position, results = lo, []
+    if checkpoint is not None:
+        progress = _Checkpoint(checkpoint, params)
+        if not os.path.exists(checkpoint):
+            progress.clear()
+        elif ambiguous:
+            raise ValueError(f"the predicate {key} cannot be matched with "
+                "the checkpoint; pass a key to resume")
+        else:
+            position, results = progress.load()
+
+    saved = time.monotonic()
+    while position < hi:
+        stop = min(position + chunk_size, hi)
+        results.extend(n for n in range(position, stop) if predicate(n))
+        position = stop
+        if checkpoint is not None and (position == hi or time.monotonic() - saved >= interval):
+            progress.save(position, results)
+            saved = time.monotonic()
+    return results
+
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# Number of digits converted directly at the leaves of the
+# divide-and-conquer conversions.
+_LEAF_DIGITS = 64
+
+
+def _check_base(base: int) -> None:
+    """Raise an error if base is not an integer from 2 to 36."""
+    if not isinstance(base, int):
+        raise TypeError("base must be an integer")
+    if not 2 <= base <= 36:
+        raise ValueError("base must be between 2 and 36")
+
+
+def _power_of_two_digits(n: int, s: int) -> str:
+    """Return the digits of n >= 0 in base 2^s without leading zeros."""
+    if s in (1, 3, 4):
+        return format(n, {1: "b", 3: "o", 4: "x"}[s])
+    bits = format(n, "b")
+    bits = "0" * (-len(bits) % s) + bits
+    return "".join(_DIGITS[int(bits[j:j+s], 2)] for j in range(0, len(bits), s))
+
+
+def _leaf_digits(n: int, base: int) -> str:
+    """Return the digits of 0 <= n < base^_LEAF_DIGITS without leading zeros."""
+    if base == 10:
+        return str(n)
+    if n == 0:
+        return "0"
+    digits = []
+    while n:
+        n, r = divmod(n, base)
+        digits.append(_DIGITS[r])
+    return "".join(reversed(digits))
+
+
+def _write_digits(n: int, base: int, write: Callable[[str], object]) -> None:
+    """Pass the digits of n >= 0 to write in chunks,
+    the most significant digits first.
+    """
+    s = base.bit_length() - 1
+    if base == 1 << s:
+        # Chunks of the byte string hold a whole number of digits,
+        # counting from the least significant end.
+        data = n.to_bytes(max(1, (n.bit_length() + 7) // 8), "big")
+        size = 512 * s
+        width = 8 * size // s
+        head = len(data) % size or size
+        write(_power_of_two_digits(int.from_bytes(data[:head], "big"), s))
+        for j in range(head, len(data), size):
+            chunk = int.from_bytes(data[j:j+size], "big")
+            write(_power_of_two_digits(chunk, s).zfill(width))
+        return
+
+    # powers[k] = base^(_LEAF_DIGITS * 2^k)
+    powers = [base ** _LEAF_DIGITS]
+    while powers[-1] <= n:
+        powers.append(powers[-1] ** 2)
+
+    def write_part(n: int, k: int, pad: bool) -> None:
+        # n < powers[k+1], padded to _LEAF_DIGITS * 2^(k+1) digits if pad
+        if k < 0:
+            digits = _leaf_digits(n, base)
+            write(digits.zfill(_LEAF_DIGITS) if pad else digits)
+            return
+        hi, lo = divmod(n, powers[k])
+        if hi or pad:
+            write_part(hi, k-1, pad)
+            write_part(lo, k-1, True)
+        else:
+            write_part(lo, k-1, False)
+
+    write_part(n, len(powers) - 2, False)
+
+
+def _parse_digits(s: str, base: int) -> int:
+    """Return the integer with the digits s in base, for a nonempty
+    string s of valid digits.
+    """
+    e = base.bit_length() - 1
+    if base == 1 << e:
+        return int(s, base)
+
+    powers = {}
+    def parse(s: str) -> int:
+        if len(s) <= _LEAF_DIGITS:
+            return int(s, base)
+        width = _LEAF_DIGITS
+        while 2 * width < len(s):
+            width *= 2
+        if width not in powers:
+            powers[width] = base ** width
+        return parse(s[:-width]) * powers[width] + parse(s[-width:])
+    return parse(s)
+
+
+def _check_digits(s: str, base: int) -> None:
+    """Raise ValueError if s is empty or has a character
+    which is not a digit in base.
+    """
+    if s == "":
+        raise ValueError("the string must be nonempty")
+    digits = _DIGITS[:base] + _DIGITS[10:base].upper()
+    if s.lstrip(digits):
+        raise ValueError(f"the string contains a character which is not a digit in base {base}")
+
+
+def to_base(n: int, base: int) -> str:
+    """Return a string of the digits of n >= 0 in base 2 <= base <= 36.
+
+    The conversion takes linear time for powers of two and uses
+    divide-and-conquer over the powers base^(64*2^k) otherwise.
+    """
     if not isinstance(n, int):
         raise TypeError("argument must be an integer")
     if n < 0:
         raise ValueError("number must be nonnegative integer")
-    if n == 0:
-        return "0"
+    _check_base(base)
+
+    chunks = []
+    _write_digits(n, base, chunks.append)
+    return "".join(chunks)
 
-    b = ""
-    while n:
-        b = str(n % 2) + b
-        n //= 2
-    return b
+
+def from_base(s: str, base: int) -> int:
+    """Return the integer whose digits in base 2 <= base <= 36 are s.
+
+    The conversion takes linear time for powers of two and uses
+    divide-and-conquer with multiplications otherwise.
+    """
+    if not isinstance(s, str):
+        raise TypeError("argument must be a string")
+    _check_base(base)
+    _check_digits(s, base)
+    return _parse_digits(s, base)
+
+
+def write_base(n: int, base: int, fp: TextIOBase) -> int:
+    """Write the digits of n >= 0 in base 2 <= base <= 36 to a text file
+    fp in chunks, and return the number of digits written.
+    """
+    if not isinstance(n, int):
+        raise TypeError("argument must be an integer")
+    if n < 0:
+        raise ValueError("number must be nonnegative integer")
+    _check_base(base)
+
+    count = 0
+    def write(digits: str) -> None:
+        nonlocal count
+        fp.write(digits)
+        count += len(digits)
+    _write_digits(n, base, write)
+    return count
+
+
+def read_base(fp: TextIOBase, base: int, chunk_size: int = 1 << 16) -> int:
+    """Read the digits of an integer in base 2 <= base <= 36
+    from a text file fp, ignoring whitespace.
+
+    The file is read in chunks of chunk_size characters. The values
+    of the chunks are combined pairwise like a binary counter, so the
+    multiplications stay balanced.
+    """
+    _check_base(base)
+    s = base.bit_length() - 1
+    stack = [] # pairs (value, number of digits)
+
+    def merge() -> None:
+        lo, lo_len = stack.pop()
+        hi, hi_len = stack.pop()
+        if base == 1 << s:
+            stack.append(((hi << (s * lo_len)) | lo, hi_len + lo_len))
+        else:
+            stack.append((hi * base**lo_len + lo, hi_len + lo_len))
+
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            break
+        chunk = "".join(chunk.split())
+        if not chunk:
+            continue
+        _check_digits(chunk, base)
+        stack.append((_parse_digits(chunk, base), len(chunk)))
+        while len(stack) >= 2 and stack[-2][1] <= stack[-1][1]:
+            merge()
+
+    if not stack:
+        raise ValueError("the file contains no digits")
+    while len(stack) >= 2:
+        merge()
+    return stack[0][0]
+
+
+def decimal2binary(n: int) -> str:
+    """Return a string consisting digits of binary expansion of n."""
+    return to_base(n, 2)
 
 
 def binary2decimal(b: str) -> int:
     """Given a string b of digits of binary expansion,
     returns its decimal representation.
     """
-    if not isinstance(b, str):
-        raise TypeError("argument must be a string")
-    
-    n = 0;
-    p = len(b)-1
-    for j in range(len(b)):
-        n += 2**(p-j) * int(b[j])
-    return n
+    return from_base(b, 2)
+
+
+class ModContext:
+    """Modular exponentiation with a fixed modulus.
+
+    Parameters
+    ----------
+    m : int
+        The modulus, m >= 1.
+
+    Notes
+    -----
+    A single power is computed by the builtin pow, which already does
+    window exponentiation in C. For a base used with many exponents,
+    precompute stores the powers a^(j*16^i) mod m, after which a^k mod m
+    costs one multiplication per nonzero hexadecimal digit of k and no
+    squarings.
+    """
+    __slots__ = ("modulus", "_tables")
+
+    def __init__(self, m: int):
+        if not isinstance(m, int):
+            raise TypeError("the modulus must be an integer")
+        if m < 1:
+            raise ValueError("the modulus must be positive")
+        self.modulus = m
+        self._tables = {}
+
+    def precompute(self, a: int, bits: int) -> None:
+        """Store a table of powers of a for the exponents below 2^bits."""
+        m = self.modulus
+        table = []
+        g = a % m
+        for _ in range(-(-bits // 4)):
+            powers = [1, g]
+            for _ in range(15):
+                powers.append(powers[-1] * g % m)
+            g = powers.pop()
+            table.append(dict(zip("0123456789abcdef", powers)))
+        self._tables[a % m] = table
+
+    def pow(self, a: int, k: int) -> int:
+        """Compute a^k mod m for k >= 0."""
+        if k < 0:
+            raise ValueError("the exponent must be nonnegative")
+
+        m = self.modulus
+        table = self._tables.get(a % m)
+        if table is None or k.bit_length() > 4 * len(table):
+            return pow(a, k, m)
+
+        b = 1
+        for powers, h in zip(table, reversed(format(k, "x"))):
+            if h != "0":
+                b = b * powers[h] % m
+        return b % m
+
+    def pow_many(self, bases: list[int], k: int) -> list[int]:
+        """Compute a^k mod m for every a in bases."""
+        return [self.pow(a, k) for a in bases]
+
+
+# The contexts returned by mod_context, oldest first.
+_mod_contexts = {}
+
+
+def mod_context(m: int) -> ModContext:
+    """Return the ModContext of modulus m shared with power_mod.
+    The 128 most recently created contexts are kept.
+    """
+    context = _mod_contexts.get(m)
+    if context is None:
+        context = _mod_contexts[m] = ModContext(m)
+        if len(_mod_contexts) > 128:
+            del _mod_contexts[next(iter(_mod_contexts))]
+    return context
 
 
 def power_mod(a: int, k: int, m: int) -> int:
-    """Compute a^k mod m by successive squaring."""
-    b = 1
-    while k >= 1:
-        if k % 2 == 1:
-            b = b*a % m
-        a = a**2 % m
-        k //= 2
-    return b
+    """Compute a^k mod m, with the shared ModContext of m if
+    mod_context(m) was called, and the builtin pow otherwise.
+
+    Tables stored by mod_context(m).precompute(a, bits) are used here.
+    """
+    if k < 1:
+        return 1
+    context = _mod_contexts.get(m)
+    if context is None:
+        return pow(a, k, m)
+    return context.pow(a, k)
+
+
+def _order_mod_prime(a: int, p: int) -> int:
+    """Return the multiplicative order of a modulo a prime p not dividing a."""
+    order = p - 1
+    for q in decompose(p - 1) if p > 2 else ():
+        while order % q == 0 and pow(a, order // q, p) == 1:
+            order //= q
+    return order
+
+
+@lru_cache(maxsize=8)
+def _screen_filters(bases: tuple[int, ...], bound: int) -> list[tuple[int, int]]:
+    """Return the pairs (p, l) for the odd primes p <= bound, where l is
+    the lcm of the orders of the bases modulo p, or 0 if p divides a base.
+
+    If p divides a pseudoprime n to all the bases, then l is nonzero
+    and divides n - 1.
+    """
+    filters = []
+    for p in _base_primes(bound):
+        if any(a % p == 0 for a in bases):
+            filters.append((p, 0))
+            continue
+        l = 1
+        for a in bases:
+            k = _order_mod_prime(a, p)
+            l = l * k // _gcd(l, k)
+        filters.append((p, l))
+    return filters
+
+
+def _screen_segment(start: int, count: int, bases: tuple[int, ...],
+        strong: bool, bound: int) -> list[int]:
+    """Return the pseudoprimes to all the bases among the odd numbers
+    start, start+2, ..., start+2*(count-1).
+    """
+    flags = _sieve_segment(start, count, _base_primes(bound))
+    # 1 for the odd composites
+    candidates = flags.translate(bytes([1, 0]) + bytes(254))
+    if start == 1:
+        candidates[0] = 0
+
+    stop = start + 2*count
+    for p, l in _screen_filters(bases, bound):
+        m = -(-start // p) * p # the first odd multiple of p >= start
+        if m % 2 == 0:
+            m += p
+        if m >= stop:
+            continue
+        j = (m - start) // 2
+        if l == 0:
+            candidates[j::p] = bytes(len(range(j, count, p)))
+            continue
+        # The odd multiples m + 2*p*t with m + 2*p*t = 1 mod l are
+        # those with t = t0 mod l2; strike out the others.
+        g = _gcd(2, l)
+        l2 = l // g
+        if l2 == 1:
+            continue
+        t0 = (1 - m) // g * pow(2*p // g, -1, l2) % l2
+        kept = candidates[j + p*t0::p*l2]
+        candidates[j::p] = bytes(len(range(j, count, p)))
+        candidates[j + p*t0::p*l2] = kept
+
+    pseudoprimes = [start + 2*j for j in compress(range(count), candidates)]
+    for a in bases:
+        if strong:
+            pseudoprimes = [n for n in pseudoprimes if _is_strong_prp(n, a)]
+        else:
+            pseudoprimes = [n for n in pseudoprimes if pow(a, n - 1, n) == 1]
+    return pseudoprimes
+
+
+def pseudoprimes_between(lo: int, hi: int, bases: tuple[int, ...] = (2,),
+        strong: bool = False, workers: int | None = None) -> Iterator[int]:
+    """Yield the odd composite n with lo <= n < hi which are Fermat
+    pseudoprimes, or strong pseudoprimes if strong, to every base.
+
+    Parameters
+    ----------
+    lo, hi : int
+    bases : tuple of int, default=(2,)
+        The bases, each greater than 1.
+    strong : bool, default=False
+        Whether to test for strong pseudoprimes.
+    workers : int or None, default=None
+        The number of processes, os.cpu_count() if None.
+        With 1, everything runs in the calling process.
+
+    Notes
+    -----
+    Each segment is sieved to skip the primes. A prime p can only
+    divide a pseudoprime n if the orders of the bases modulo p divide
+    n - 1, so the sieve also strikes out the other multiples of each
+    base prime p <= sqrt(hi). Only the few remaining numbers are tested,
+    in the worker processes, and the results are yielded in increasing
+    order as segments complete.
+    """
+    if not ( isinstance(lo, int) and isinstance(hi, int) ):
+        raise TypeError("the arguments must be integers")
+    bases = tuple(bases)
+    if not bases or any(not isinstance(a, int) or a < 2 for a in bases):
+        raise ValueError("the bases must be integers greater than 1")
+
+    start = max(lo, 3) | 1
+    if start >= hi:
+        return
+    bound = isqrt(hi - 1)
+    segments = ((s, min(_SEGMENT_SIZE, (hi - s + 1) // 2))
+        for s in range(start, hi, 2*_SEGMENT_SIZE))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers == 1:
+        for s, count in segments:
+            yield from _screen_segment(s, count, bases, strong, bound)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as executor:
+        # keep a bounded number of segments in flight, in order
+        pending = deque()
+        for s, count in segments:
+            pending.append(executor.submit(_screen_segment, s, count, bases, strong, bound))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def is_carmichael(n: int) -> bool:
+    """Check if n is a Carmichael number by Korselt's criterion:
+    n is composite, squarefree, and p - 1 divides n - 1 for every prime p | n.
+    """
+    if n < 3 or n % 2 == 0 or is_prime(n):
+        return False
+    D = decompose(n)
+    return all(e == 1 and (n - 1) % (p - 1) == 0 for p, e in D.items())
+
+
+def carmichael_between(lo: int, hi: int, workers: int | None = None) -> Iterator[int]:
+    """Yield the Carmichael numbers n with lo <= n < hi in increasing order.
+
+    Carmichael numbers are odd pseudoprimes to base 2, so the candidates
+    come from pseudoprimes_between and are checked by is_carmichael.
+    """
+    for n in pseudoprimes_between(lo, hi, (2,), workers=workers):
+        if is_carmichael(n):
+            yield n
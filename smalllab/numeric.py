@@ -1,8 +1,10 @@
 """This module contains functions related to numerical methods.
 """
 
+from cmath import exp as cexp
 from collections.abc import Callable
-from smalllab.calculus import sign
+from math import pi
+from smalllab.calculus import chebyshev_zeros, sign
 
 number = int | float
 
@@ -159,15 +161,169 @@ def newton_divdif(X: list[number], Y: list[number], xp: number) -> float:
 
 def near_minimax(f: Callable[[number], number], n: int) -> Callable:
     """Construct the near minimax approximation of degree n
-    for a given function f on [-1,1] using newton divided difference.
+    for a given function f on [-1,1], the interpolating polynomial
+    at the chebyshev zeros, as a ChebyshevSeries.
     """
-    from smalllab.calculus import chebyshev_zeros
-    
-    nodes = chebyshev_zeros(n+1)
-    y_values = [f(x) for x in nodes]
-    def near_minimax_(xp):
-        return newton_divdif(nodes, y_values, xp)
-    return near_minimax_
+    return ChebyshevSeries.fit(f, n)
+
+
+def _fft(a: list[complex], inverse: bool = False) -> list[complex]:
+    """Compute the discrete Fourier transform of a, whose length is a
+    power of 2, by the iterative radix-2 algorithm. The inverse is
+    not divided by the length.
+    """
+    n = len(a)
+    a = list(a)
+    j = 0
+    for i in range(1, n):
+        bit = n >> 1
+        while j & bit:
+            j ^= bit
+            bit >>= 1
+        j |= bit
+        if i < j:
+            a[i], a[j] = a[j], a[i]
+
+    sign = 1 if inverse else -1
+    size = 2
+    while size <= n:
+        half = size // 2
+        roots = [cexp(sign * 2j * pi * k / size) for k in range(half)]
+        for start in range(0, n, size):
+            for k in range(half):
+                u = a[start + k]
+                v = a[start + k + half] * roots[k]
+                a[start + k] = u + v
+                a[start + k + half] = u - v
+        size *= 2
+    return a
+
+
+def _dft(a: list[complex]) -> list[complex]:
+    """Compute the discrete Fourier transform of a of any length,
+    by Bluestein's algorithm if the length is not a power of 2.
+    """
+    n = len(a)
+    if n & (n - 1) == 0:
+        return _fft(a)
+
+    # a_k w^(k^2/2) convolved with w^(-k^2/2), for w = exp(-2 pi i / n)
+    chirp = [cexp(-1j * pi * (k*k % (2*n)) / n) for k in range(n)]
+    m = 1 << (2*n - 1).bit_length()
+    u = [x * w for x, w in zip(a, chirp)] + [0] * (m - n)
+    v = [w.conjugate() for w in chirp] + [0] * (m - 2*n + 1) \
+        + [w.conjugate() for w in reversed(chirp[1:])]
+    conv = _fft([x * y for x, y in zip(_fft(u), _fft(v))], inverse=True)
+    return [conv[k] * chirp[k] / m for k in range(n)]
+
+
+class ChebyshevSeries:
+    """The function sum of coefs[k] * T_k(t) of x in the domain [a, b],
+    where T_k is the chebyshev polynomial of degree k and
+    t = (2x - a - b) / (b - a) is in [-1, 1].
+
+    Parameters
+    ----------
+    coefs : list of float
+        The coefficients, that of T_0 first.
+    domain : tuple of float, default=(-1.0, 1.0)
+    """
+    __slots__ = ("coefs", "domain")
+
+    def __init__(self, coefs: list[number], domain: tuple[number, number] = (-1.0, 1.0)):
+        if len(coefs) == 0:
+            raise ValueError("the list cannot be empty")
+        if not domain[0] < domain[1]:
+            raise ValueError("the domain must be an interval [a, b] with a < b")
+        self.coefs = list(coefs)
+        self.domain = tuple(domain)
+
+    @classmethod
+    def fit(cls, f: Callable[[number], number], n: int | None = None,
+            domain: tuple[number, number] = (-1.0, 1.0)) -> "ChebyshevSeries":
+        """Interpolate f at the n + 1 chebyshev zeros mapped to the domain.
+
+        The coefficients are a discrete cosine transform of the values,
+        computed by a Fourier transform in O(n log n).
+        If n is None, n runs through 2^k - 1 from 15 until the last
+        coefficients are negligible and the series is truncated; a
+        ValueError is raised if f is not resolved with n = 2^16 - 1.
+        """
+        if n is None:
+            # n + 1 points, a power of 2, need no Bluestein transform
+            n = 15
+            while True:
+                series = cls.fit(f, n, domain)
+                scale = max(map(abs, series.coefs)) or 1.0
+                tail = max(map(abs, series.coefs[-4:]))
+                if tail <= 2**-50 * scale:
+                    return series.truncate(2**-52 * scale)
+                if n >= (1 << 16) - 1:
+                    raise ValueError(f"f is not resolved by {n + 1} coefficients")
+                n = 2*n + 1
+        if n < 0:
+            raise ValueError("n must be nonnegative integer")
+
+        N = n + 1
+        a, b = domain
+        y = [f((b - a) / 2 * t + (a + b) / 2) for t in chebyshev_zeros(N)]
+        # Makhoul's reordering turns the DCT into a DFT of the same length
+        v = y[::2] + y[1::2][::-1]
+        V = _dft(v)
+        coefs = [2 / N * (cexp(-1j * pi * k / (2*N)) * V[k]).real for k in range(N)]
+        coefs[0] /= 2
+        return cls(coefs, domain)
+
+    def __call__(self, x: number) -> float:
+        """Evaluate the series at x by Clenshaw's recurrence."""
+        a, b = self.domain
+        t = (2*x - a - b) / (b - a)
+        b1 = b2 = 0.0
+        for c in reversed(self.coefs[1:]):
+            b1, b2 = c + 2*t*b1 - b2, b1
+        return self.coefs[0] + t*b1 - b2
+
+    def truncate(self, tol: number) -> "ChebyshevSeries":
+        """Return the series without its last coefficients of absolute
+        value at most tol, keeping at least one coefficient.
+        """
+        n = len(self.coefs)
+        while n > 1 and abs(self.coefs[n-1]) <= tol:
+            n -= 1
+        return ChebyshevSeries(self.coefs[:n], self.domain)
+
+    def derivative(self) -> "ChebyshevSeries":
+        """Return the derivative as a ChebyshevSeries on the same domain."""
+        c = self.coefs
+        n = len(c) - 1
+        if n == 0:
+            return ChebyshevSeries([0.0], self.domain)
+
+        # d_(k-1) = d_(k+1) + 2k c_k, halved for k = 1
+        scale = 2 / (self.domain[1] - self.domain[0])
+        d = [0.0] * (n + 2)
+        for k in range(n, 0, -1):
+            d[k-1] = d[k+1] + 2 * k * c[k]
+        d[0] /= 2
+        return ChebyshevSeries([x * scale for x in d[:n]], self.domain)
+
+    def integral(self) -> "ChebyshevSeries":
+        """Return the antiderivative vanishing at the start of the domain."""
+        c = self.coefs + [0.0, 0.0]
+        n = len(self.coefs)
+        scale = (self.domain[1] - self.domain[0]) / 2
+
+        # C_k = (c_(k-1) - c_(k+1)) / 2k, with c_0 doubled
+        C = [0.0] * (n + 1)
+        for k in range(1, n + 1):
+            previous = 2 * c[0] if k == 1 else c[k-1]
+            C[k] = (previous - c[k+1]) / (2*k) * scale
+        # T_k(-1) = (-1)^k
+        C[0] = sum(C[k] if k % 2 else -C[k] for k in range(1, n + 1))
+        return ChebyshevSeries(C, self.domain)
+
+    def __repr__(self) -> str:
+        return f"ChebyshevSeries({self.coefs}, {self.domain})"
 
 
 def trapezoidal(f: Callable, a: number, b: number, n: int) -> float:
@@ -9,11 +9,84 @@ class TestUnits(unittest.TestCase):
         self.assertEqual([1, 3, 5, 7], units(8))
         self.assertEqual([1, 2, 4, 7, 8, 11, 13, 14], units(15))
         self.assertEqual(list(range(1, 11)), units(11))
+        self.assertEqual([1], units(2))
+
+    def test_agrees_with_gcd(self):
+        from math import gcd
+        for n in range(2, 300):
+            self.assertEqual([a for a in range(1, n) if gcd(a, n) == 1], units(n))
     
     def test_must_be_greater_than_1(self):
         with self.assertRaises(ValueError):
             units(1)    
 
 
+class TestMultiplicativeOrder(unittest.TestCase):
+    # smalllab.algebra.multiplicative_order
+
+    def test_some_values(self):
+        self.assertEqual(10, multiplicative_order(2, 11))
+        self.assertEqual(2, multiplicative_order(-1, 1000))
+        self.assertEqual(1, multiplicative_order(1, 7))
+        self.assertEqual(1, multiplicative_order(5, 1))
+        self.assertEqual(2**61 - 2, multiplicative_order(37, 2**61 - 1))
+
+    def test_agrees_with_powering(self):
+        for n in range(2, 200):
+            for a in units(n):
+                k, x = 1, a % n
+                while x != 1 % n:
+                    k, x = k + 1, x * a % n
+                self.assertEqual(k, multiplicative_order(a, n))
+
+    def test_must_be_coprime(self):
+        with self.assertRaises(ValueError):
+            multiplicative_order(6, 9)
+
+
+class TestIsPrimitiveRoot(unittest.TestCase):
+    # smalllab.algebra.is_primitive_root
+
+    def test_some_values(self):
+        self.assertTrue(is_primitive_root(3, 7))
+        self.assertTrue(is_primitive_root(10, 7))
+        self.assertFalse(is_primitive_root(2, 7))
+        self.assertFalse(is_primitive_root(7, 14))
+        self.assertFalse(is_primitive_root(3, 8))
+
+    def test_agrees_with_order(self):
+        for n in range(2, 200):
+            phi = len(units(n))
+            for g in units(n):
+                self.assertEqual(multiplicative_order(g, n) == phi, is_primitive_root(g, n))
+
+
+class TestPrimitiveRoot(unittest.TestCase):
+    # smalllab.algebra.primitive_root
+
+    def test_some_values(self):
+        self.assertEqual([1, 2, 3, 2, 5, 3, 2, 2], [primitive_root(n) for n in [2, 3, 4, 5, 6, 7, 9, 11]])
+        self.assertEqual(7, primitive_root(71))
+        self.assertEqual(3, primitive_root(2 * 5**7))
+        self.assertEqual(37, primitive_root(2**61 - 1))
+
+    def test_no_primitive_root(self):
+        for n in [8, 12, 15, 21, 100]:
+            with self.assertRaises(ValueError):
+                primitive_root(n)
+
+
+class TestPrimitiveRoots(unittest.TestCase):
+    # smalllab.algebra.primitive_roots
+
+    def test_some_values(self):
+        self.assertEqual([3, 5], sorted(primitive_roots(7)))
+        self.assertEqual([2, 5, 11, 14, 20, 23], sorted(primitive_roots(27)))
+
+    def test_agrees_with_is_primitive_root(self):
+        for n in [2, 4, 18, 49, 50, 97, 1250]:
+            self.assertEqual([g for g in units(n) if is_primitive_root(g, n)], sorted(primitive_roots(n)))
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -11,6 +11,110 @@ class TestSign(unittest.TestCase):
         self.assertEqual(-1, sign(-1.3))
 
 
+class TestPolynomial(unittest.TestCase):
+    # smalllab.calculus.Polynomial
+
+    def test_some_values(self):
+        p = Polynomial([-3, 0, -2, 17])
+        self.assertEqual(3, p.degree)
+        self.assertEqual(17, p(0))
+        self.assertEqual(-3*10**30 - 2*10**10 + 17, p(10**10))
+        self.assertAlmostEqual(-3*0.5**3 - 2*0.5 + 17, p(0.5))
+        self.assertEqual(Polynomial([1, 2]), Polynomial([1.0, 2.0]))
+        self.assertEqual("-3x^3-2x+17", str(p))
+
+    def test_exact_for_integers(self):
+        p = Polynomial([1, 0, 0, 1])
+        self.assertIs(int, type(p(3)))
+        self.assertEqual(10**60 + 1, p(10**20))
+
+    def test_generic_values(self):
+        from fractions import Fraction
+        p = Polynomial([2, -1, 1])
+        self.assertEqual(Fraction(7, 8), p(Fraction(1, 4)))
+        self.assertEqual(2*(1+1j)**2 - (1+1j) + 1, p(1+1j))
+
+    def test_eval_many(self):
+        p = Polynomial([0.5, -1.25, 3, 2])
+        xs = [j / 7 for j in range(-20, 20)]
+        self.assertEqual([p(x) for x in xs], list(p.eval_many(xs)))
+        q = Polynomial([2, 0, -1])
+        self.assertEqual([q(x) for x in range(10)], q.eval_many(range(10)))
+        self.assertEqual([q(1), q(0.5)], q.eval_many([1, 0.5]))
+        self.assertEqual([], q.eval_many([]))
+
+    def test_cannot_be_empty(self):
+        with self.assertRaises(ValueError):
+            Polynomial([])
+
+
+class TestSparsePolynomial(unittest.TestCase):
+    # smalllab.calculus.SparsePolynomial
+
+    def test_some_values(self):
+        p = SparsePolynomial({10**6: 1, 1: 3, 0: 1})
+        self.assertEqual(10**6, p.degree)
+        self.assertEqual(5, p(1))
+        self.assertEqual(2**(10**6) + 7, p(2))
+        self.assertEqual(-1, p(-1))
+        self.assertAlmostEqual(1.5**20 + 4.5 + 1, SparsePolynomial({20: 1, 1: 3, 0: 1})(1.5))
+        self.assertEqual(0, SparsePolynomial({})(3))
+        self.assertEqual([9, 12], SparsePolynomial({2: 1, 0: 8}).eval_many([1, 2]))
+
+    def test_dense_conversion(self):
+        L = [2, 0, 0, -1, 0, 5]
+        p = SparsePolynomial.from_list(L)
+        self.assertEqual({5: 2, 2: -1, 0: 5}, p.terms)
+        self.assertEqual(L, p.to_list())
+        for x in range(-3, 4):
+            self.assertEqual(Polynomial(L)(x), p(x))
+        self.assertEqual(Polynomial(L), p.to_dense())
+        self.assertEqual(p.terms, Polynomial(L).to_sparse().terms)
+
+    def test_interchangeable_with_polynomial(self):
+        from fractions import Fraction
+        for L in [[3], [1, -2, 1], [0.5, 0, 0, 0, 0, 0, -1.25], [1] + [0] * 40 + [7]]:
+            dense, sparse = Polynomial(L), SparsePolynomial.from_list(L)
+            self.assertEqual(dense, sparse)
+            self.assertEqual(dense.degree, sparse.degree)
+            self.assertEqual(dense.to_list(), sparse.to_list())
+            for xs in [range(-5, 6), [j / 4 for j in range(-4, 5)], [Fraction(1, 3), 2], []]:
+                a, b = dense.eval_many(xs), sparse.eval_many(xs)
+                self.assertIs(type(a), type(b))
+                for y, z in zip(a, b):
+                    self.assertAlmostEqual(y, z)
+
+    def test_str(self):
+        self.assertEqual("1x^1000000+3x+1", str(SparsePolynomial({0: 1, 1: 3, 10**6: 1})))
+        self.assertEqual("-2x^5-1", str(SparsePolynomial({5: -2, 3: 0, 0: -1})))
+        self.assertEqual("0", str(SparsePolynomial({4: 0})))
+
+    def test_arithmetic(self):
+        p = SparsePolynomial({3: 1, 0: -1})
+        q = SparsePolynomial({3: 1, 0: 1})
+        self.assertEqual(SparsePolynomial({6: 1, 0: -1}), p * q)
+        self.assertEqual(SparsePolynomial({3: 2}), p + q)
+        self.assertEqual(SparsePolynomial({0: -2}), p - q)
+        self.assertEqual(SparsePolynomial({3: 2, 0: -3}), 2*p - 1)
+        self.assertEqual(SparsePolynomial({}), p - p)
+        self.assertEqual(SparsePolynomial({3: 1, 2: 1}), p + Polynomial([1, 0, 1]))
+        self.assertEqual(Polynomial([1, 0, 0, -1]), p)
+
+    def test_degrees_are_nonnegative_integers(self):
+        with self.assertRaises(ValueError):
+            SparsePolynomial({-1: 2})
+
+
+class TestDict2Poly(unittest.TestCase):
+    # smalllab.calculus.dict2poly
+
+    def test_representation_by_density(self):
+        self.assertIsInstance(dict2poly({100: 1, 0: 1}), SparsePolynomial)
+        p = dict2poly({2: 1, 1: -2, 0: 1})
+        self.assertIsInstance(p, Polynomial)
+        self.assertEqual([1, -2, 1], list(p.coefs))
+
+
 class TestList2Poly(unittest.TestCase):
     # smalllab.calculus.list2poly
     
@@ -21,11 +125,128 @@ class TestList2Poly(unittest.TestCase):
         for x in range(5):
             self.assertEqual(f1(x), f2(x))
 
+    def test_sparse_lists(self):
+        L = [1] + [0] * 99 + [3, 1]
+        p = list2poly(L)
+        self.assertIsInstance(p, Polynomial)
+        self.assertEqual(2**101 + 7, p(2))
+        self.assertEqual(2**101 + 7, p.to_sparse()(2))
+
     def test_cannot_be_empty(self):
         with self.assertRaises(ValueError):
             list2poly([])
 
 
+class TestPolyAdd(unittest.TestCase):
+    # smalllab.calculus.poly_add
+
+    def test_some_values(self):
+        self.assertEqual([1, 3, 5], poly_add([1, 2, 3], [1, 2]))
+        self.assertEqual([1, 3, 5], poly_add([1, 2], [1, 2, 3]))
+        self.assertEqual([3], poly_add([-1, 2], [1, 1]))
+        self.assertEqual([0], poly_add([1, 2], [-1, -2]))
+
+    def test_cannot_be_empty(self):
+        with self.assertRaises(ValueError):
+            poly_add([], [1])
+
+
+class TestPolySub(unittest.TestCase):
+    # smalllab.calculus.poly_sub
+
+    def test_some_values(self):
+        self.assertEqual([1, 1, 1], poly_sub([1, 2, 3], [1, 2]))
+        self.assertEqual([-1, -1, -1], poly_sub([1, 2], [1, 2, 3]))
+        self.assertEqual([0], poly_sub([2.5, 1], [2.5, 1]))
+
+
+class TestPolyMul(unittest.TestCase):
+    # smalllab.calculus.poly_mul
+
+    def schoolbook(self, P, Q):
+        R = [0] * (len(P) + len(Q) - 1)
+        for i, a in enumerate(P):
+            for j, b in enumerate(Q):
+                R[i+j] += a * b
+        return R
+
+    def test_some_values(self):
+        self.assertEqual([1, 0, -1], poly_mul([1, 1], [1, -1]))
+        self.assertEqual([0], poly_mul([0], [1, 2, 3]))
+        self.assertEqual([6], poly_mul([2], [3]))
+        self.assertEqual([0.5, 1.0], poly_mul([0.25, 0.5], [2.0]))
+
+    def test_integer_coefficients(self):
+        import random
+        random.seed(22)
+        for la, lb in [(1, 1), (3, 200), (200, 3), (150, 130), (2000, 1500)]:
+            P = [random.randint(-10**20, 10**20) for _ in range(la)]
+            Q = [random.randint(-5, 5) for _ in range(lb - 1)] + [7]
+            P[0] = P[0] or 1
+            Q[0] = Q[0] or 1
+            self.assertEqual(self.schoolbook(P, Q), poly_mul(P, Q))
+
+    def test_coefficients_beyond_int_str_limit(self):
+        P = [3**20000 + k for k in range(10)]
+        Q = [k - 7**12000 for k in range(12)]
+        self.assertEqual(self.schoolbook(P, P), poly_mul(P, P))
+        self.assertEqual(self.schoolbook(P, Q), poly_mul(P, Q))
+
+    def test_karatsuba(self):
+        from fractions import Fraction
+        P = [Fraction(j, 7) for j in range(1, 100)]
+        Q = [Fraction(1, j) for j in range(1, 70)]
+        self.assertEqual(self.schoolbook(P, Q), poly_mul(P, Q))
+        self.assertEqual(self.schoolbook(P, Q), poly_mul(P, Q, threshold=1))
+        P = [1.5 * j for j in range(-60, 60)]
+        for a, b in zip(self.schoolbook(P, P), poly_mul(P, P, threshold=4)):
+            self.assertAlmostEqual(a, b)
+
+
+class TestPolyDivmod(unittest.TestCase):
+    # smalllab.calculus.poly_divmod
+
+    def test_some_values(self):
+        self.assertEqual(([1, 1, 1], [0]), poly_divmod([1, 0, 0, -1], [1, -1]))
+        self.assertEqual(([1, 2], [5]), poly_divmod([1, 3, 7], [1, 1]))
+        self.assertEqual(([0.5, -0.25, 0.125], [-1.125]), poly_divmod([1, 0, 0, -1], [2, 1]))
+        self.assertEqual(([0], [1, 2]), poly_divmod([1, 2], [1, 0, 0]))
+
+    def test_inverse_of_poly_mul(self):
+        P = [3, -1, 4, 1, -5, 9]
+        D = [2, 6, -5]
+        R = [3, 5]
+        self.assertEqual((P, R), poly_divmod(poly_add(poly_mul(P, D), R), D))
+
+    def test_division_by_zero(self):
+        with self.assertRaises(ZeroDivisionError):
+            poly_divmod([1, 2], [0, 0])
+
+
+class TestPolyCompose(unittest.TestCase):
+    # smalllab.calculus.poly_compose
+
+    def test_some_values(self):
+        self.assertEqual([1, 2, 2], poly_compose([1, 0, 1], [1, 1]))
+        self.assertEqual([4], poly_compose([1, 2], [2]))
+        self.assertEqual(chebyshev_coef(6), poly_compose(chebyshev_coef(2), chebyshev_coef(3)))
+
+    def test_agrees_with_evaluation(self):
+        P, Q = [2, 0, -3, 1], [1, -1, 4]
+        R = list2poly(poly_compose(P, Q))
+        for x in range(-5, 6):
+            self.assertEqual(list2poly(P)(list2poly(Q)(x)), R(x))
+
+
+class TestPolyDerivative(unittest.TestCase):
+    # smalllab.calculus.poly_derivative
+
+    def test_some_values(self):
+        self.assertEqual([9, 4, 1], poly_derivative([3, 2, 1, 7]))
+        self.assertEqual([0], poly_derivative([5]))
+        self.assertEqual([0], poly_derivative([0, 0, 5]))
+
+
 class TestFormatPoly(unittest.TestCase):
     # smalllab.calculus.format_poly
     
@@ -87,11 +308,35 @@ class TestChebyshevCoef(unittest.TestCase):
         self.assertEqual([8, 0, -8, 0, 1], chebyshev_coef(4))
         self.assertEqual([16, 0, -20, 0, 5, 0], chebyshev_coef(5))
     
+    def test_agrees_with_recurrence(self):
+        T0, T1 = [1], [1, 0]
+        for n in range(2, 80):
+            T2 = poly_sub(poly_mul([2, 0], T1), T0)
+            self.assertEqual(T2, chebyshev_coef(n))
+            T0, T1 = T1, T2
+
+    def test_returns_a_new_list(self):
+        chebyshev_coef(7)[0] = 0
+        self.assertEqual(64, chebyshev_coef(7)[0])
+
     def test_only_nonnegative_integer(self):
         with self.assertRaises(ValueError):
             chebyshev_coef(-1)
 
 
+class TestChebyshevPolys(unittest.TestCase):
+    # smalllab.calculus.chebyshev_polys
+
+    def test_agrees_with_chebyshev_coef(self):
+        self.assertEqual([[1], [1, 0], [2, 0, -1]], list(chebyshev_polys(2)))
+        self.assertEqual([[1]], list(chebyshev_polys(0)))
+        self.assertEqual([chebyshev_coef(n) for n in range(100)], list(chebyshev_polys(99)))
+
+    def test_only_nonnegative_integer(self):
+        with self.assertRaises(ValueError):
+            list(chebyshev_polys(-1))
+
+
 class TestChebyshevZeros(unittest.TestCase):
     # smalllab.calculus.chebyshev_zeros
 
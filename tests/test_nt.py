@@ -17,6 +17,28 @@ class TestIsSquare(unittest.TestCase):
     def test_square_number(self):
         self.assertTrue(is_square(100))
 
+    def test_agrees_with_isqrt(self):
+        from math import isqrt
+        for n in range(20000):
+            self.assertEqual(isqrt(n)**2 == n, is_square(n))
+
+    def test_large_numbers(self):
+        self.assertTrue(is_square((10**40 + 7)**2))
+        self.assertFalse(is_square((10**40 + 7)**2 + 1))
+        self.assertFalse(is_square((10**40 + 7)**2 - 1))
+
+
+class TestSquaresIn(unittest.TestCase):
+    # smalllab.nt.squares_in
+
+    def test_some_values(self):
+        self.assertEqual([0, 1, 4, 9.0, 10**30], squares_in([-4, 0, 1, 2, 4, 9.0, 2.5, 10**30]))
+        self.assertEqual([], squares_in([]))
+
+    def test_agrees_with_is_square(self):
+        L = list(range(-10, 5000)) + [n*n + k for n in range(10**9, 10**9 + 100) for k in (-1, 0, 1)]
+        self.assertEqual([n for n in L if is_square(n)], squares_in(L))
+
 
 class TestGcd(unittest.TestCase):
     # smalllab.nt.gcd
@@ -40,6 +62,23 @@ class TestGcd(unittest.TestCase):
             gcd(2.5, 5)
 
 
+class TestBatchGcd(unittest.TestCase):
+    # smalllab.nt.batch_gcd
+
+    def test_some_values(self):
+        self.assertEqual([3, 7, 1, 21, 21], batch_gcd([6, 49, 10, 0, -21], 21))
+        self.assertEqual([], batch_gcd([], 10))
+
+    def test_agrees_with_gcd(self):
+        m = 2**3 * 3**4 * 5 * 7**2 * 101 * 9973
+        values = list(range(-500, 500, 7))
+        self.assertEqual([gcd(v, m) for v in values], batch_gcd(values, m))
+
+    def test_only_integer_arguments(self):
+        with self.assertRaises(ValueError):
+            batch_gcd([2.5, 5], 10)
+
+
 class TestIsCoprime(unittest.TestCase):
     # smalllab.nt.is_coprime
 
@@ -69,6 +108,267 @@ class TestIsPrime(unittest.TestCase):
         with self.assertRaises(TypeError):
             is_prime(9.0)
 
+    def test_strong_pseudoprimes(self):
+        self.assertFalse(is_prime(3215031751))
+        self.assertFalse(is_prime(3825123056546413051))
+        self.assertFalse(is_prime(318665857834031151167461))
+        self.assertFalse(is_prime(3317044064679887385961981))
+
+    def test_large_numbers(self):
+        self.assertFalse(is_prime(283976710803263))
+        self.assertTrue(is_prime(2**61 - 1))
+        self.assertTrue(is_prime(2**127 - 1))
+        self.assertTrue(is_prime(2**521 - 1))
+        self.assertFalse(is_prime((2**89 - 1) * (2**107 - 1)))
+        self.assertFalse(is_prime((2**61 - 1)**2))
+
+    def test_agrees_with_sieve(self):
+        primes = set(primes_up_to(20000))
+        for n in range(20000):
+            self.assertEqual(n in primes, is_prime(n))
+
+
+class TestExtGcd(unittest.TestCase):
+    # smalllab.nt.ext_gcd
+
+    def test_bezout_identity(self):
+        for a, b in [(240, 46), (46, 240), (-240, 46), (17, 0), (0, -5), (0, 0), (2**89 - 1, 3**50)]:
+            g, x, y = ext_gcd(a, b)
+            self.assertEqual(gcd(a, b), g)
+            self.assertEqual(g, a*x + b*y)
+
+
+class TestModInverse(unittest.TestCase):
+    # smalllab.nt.mod_inverse
+
+    def test_some_values(self):
+        self.assertEqual(4, mod_inverse(3, 11))
+        self.assertEqual(7, mod_inverse(-3, 11))
+        self.assertEqual(0, mod_inverse(5, 1))
+        p = 2**127 - 1
+        self.assertEqual(1, 12345 * mod_inverse(12345, p) % p)
+
+    def test_not_invertible(self):
+        with self.assertRaises(ValueError):
+            mod_inverse(6, 9)
+        with self.assertRaises(ValueError):
+            mod_inverse(3, 0)
+
+
+class TestCrt(unittest.TestCase):
+    # smalllab.nt.crt
+
+    def test_coprime_moduli(self):
+        self.assertEqual((23, 105), crt([2, 3, 2], [3, 5, 7]))
+        self.assertEqual((0, 1), crt([], []))
+
+    def test_non_coprime_moduli(self):
+        self.assertEqual((10, 12), crt([4, 2], [6, 4]))
+        self.assertEqual((11, 36), crt([2, 11, 3], [9, 12, 4]))
+
+    def test_agrees_with_search(self):
+        for m1 in range(1, 13):
+            for m2 in range(1, 13):
+                for r1 in range(m1):
+                    for r2 in range(m2):
+                        L = [x for x in range(m1 * m2) if x % m1 == r1 and x % m2 == r2]
+                        if L:
+                            x, M = crt([r1, r2], [m1, m2])
+                            self.assertEqual(L[0], x)
+                            self.assertEqual(L, list(range(x, m1 * m2, M)))
+                        else:
+                            with self.assertRaises(ValueError):
+                                crt([r1, r2], [m1, m2])
+
+
+class TestBatchInverse(unittest.TestCase):
+    # smalllab.nt.batch_inverse
+
+    def test_agrees_with_mod_inverse(self):
+        p = 2**61 - 1
+        values = [3**k % p for k in range(1, 200)] + [p - 1, 1]
+        self.assertEqual([mod_inverse(a, p) for a in values], batch_inverse(values, p))
+        self.assertEqual([1, 3, 7, 9], batch_inverse([1, 7, 3, 9], 10))
+        self.assertEqual([], batch_inverse([], 7))
+
+    def test_not_invertible(self):
+        with self.assertRaises(ValueError):
+            batch_inverse([1, 3, 4, 5], 8)
+
+
+class TestJacobi(unittest.TestCase):
+    # smalllab.nt.jacobi
+
+    def test_some_values(self):
+        self.assertEqual(1, jacobi(1, 9))
+        self.assertEqual(-1, jacobi(2, 3))
+        self.assertEqual(0, jacobi(6, 9))
+        self.assertEqual(-1, jacobi(1001, 9907))
+        self.assertEqual(1, jacobi(19, 45))
+
+    def test_only_odd_positive_n(self):
+        with self.assertRaises(ValueError):
+            jacobi(3, 8)
+        with self.assertRaises(ValueError):
+            jacobi(3, -5)
+
+
+class TestPrimesBetween(unittest.TestCase):
+    # smalllab.nt.primes_between
+
+    def test_some_intervals(self):
+        self.assertEqual([2, 3, 5, 7], primes_between(0, 10))
+        self.assertEqual([11, 13, 17, 19], primes_between(11, 23))
+        self.assertEqual([], primes_between(24, 29))
+        self.assertEqual([], primes_between(10, 2))
+
+    def test_agrees_with_is_prime(self):
+        lo, hi = 10**6, 10**6 + 5000
+        L = [n for n in range(lo, hi) if is_prime(n)]
+        self.assertEqual(L, primes_between(lo, hi))
+
+    def test_non_int_type(self):
+        with self.assertRaises(TypeError):
+            primes_between(1.0, 10)
+
+
+class TestIterPrimes(unittest.TestCase):
+    # smalllab.nt.iter_primes
+
+    def test_first_primes(self):
+        from itertools import islice
+        self.assertEqual(primes_up_to(611953), list(islice(iter_primes(), 50000)))
+
+    def test_start(self):
+        from itertools import islice
+        self.assertEqual([2, 3, 5], list(islice(iter_primes(-7), 3)))
+        self.assertEqual([11, 13, 17], list(islice(iter_primes(11), 3)))
+        self.assertEqual([10**12 + 39, 10**12 + 61], list(islice(iter_primes(10**12), 2)))
+
+    def test_non_int_type(self):
+        with self.assertRaises(TypeError):
+            next(iter_primes(2.0))
+
+
+class TestParallelPrimesBetween(unittest.TestCase):
+    # smalllab.nt.parallel_primes_between
+
+    def test_agrees_with_serial_sieve(self):
+        for lo, hi in [(0, 2), (0, 3), (0, 100), (17, 18), (10**6, 10**6 + 600000)]:
+            self.assertEqual(primes_between(lo, hi), parallel_primes_between(lo, hi, 2))
+
+    def test_non_int_type(self):
+        with self.assertRaises(TypeError):
+            parallel_primes_between(0, 10.0)
+
+
+class TestPrimesUpTo(unittest.TestCase):
+    # smalllab.nt.primes_up_to
+
+    def test_some_values(self):
+        self.assertEqual([], primes_up_to(1))
+        self.assertEqual([2], primes_up_to(2))
+        self.assertEqual([2, 3, 5, 7, 11, 13], primes_up_to(13))
+
+    def test_prime_counts(self):
+        self.assertEqual(168, len(primes_up_to(1000)))
+        self.assertEqual(78498, len(primes_up_to(10**6)))
+
+
+class TestPrimeCount(unittest.TestCase):
+    # smalllab.nt.prime_count
+
+    def test_agrees_with_sieve(self):
+        primes = primes_up_to(5000)
+        for x in range(-2, 5001, 7):
+            self.assertEqual(len([p for p in primes if p <= x]), prime_count(x))
+
+    def test_large_values(self):
+        self.assertEqual(78498, prime_count(10**6))
+        self.assertEqual(5761455, prime_count(10**8))
+
+    def test_non_int_type(self):
+        with self.assertRaises(TypeError):
+            prime_count(10.0)
+
+
+class TestPrimeSum(unittest.TestCase):
+    # smalllab.nt.prime_sum
+
+    def test_agrees_with_sieve(self):
+        primes = primes_up_to(5000)
+        for x in range(-2, 5001, 7):
+            self.assertEqual(sum(p for p in primes if p <= x), prime_sum(x))
+
+    def test_large_values(self):
+        self.assertEqual(sum(primes_up_to(10**6)), prime_sum(10**6))
+        self.assertEqual(279209790387276, prime_sum(10**8))
+
+
+class TestPrimeSet(unittest.TestCase):
+    # smalllab.nt.PrimeSet
+
+    def test_agrees_with_sieve(self):
+        for N in [1, 2, 6, 7, 29, 30, 31, 1000, 54321]:
+            S = PrimeSet(N)
+            primes = primes_up_to(N)
+            self.assertEqual(primes, list(S))
+            self.assertEqual(len(primes), len(S))
+
+    def test_membership(self):
+        S = PrimeSet(10000)
+        primes = set(primes_up_to(10000))
+        for n in range(-5, 10001):
+            self.assertEqual(n in primes, n in S)
+        with self.assertRaises(ValueError):
+            10001 in S
+
+    def test_next_and_prev_prime(self):
+        S = PrimeSet(1000)
+        self.assertEqual(2, S.next_prime(-10))
+        self.assertEqual(7, S.next_prime(5))
+        self.assertEqual(907, S.next_prime(887))
+        self.assertEqual(887, S.prev_prime(907))
+        self.assertEqual(5, S.prev_prime(7))
+        self.assertEqual(997, S.prev_prime(1001))
+        with self.assertRaises(ValueError):
+            S.next_prime(997)
+        with self.assertRaises(ValueError):
+            S.prev_prime(2)
+
+    def test_rank_and_select(self):
+        S = PrimeSet(200000)
+        primes = primes_up_to(200000)
+        for k in [1, 2, 3, 4, 5, 100, 9999, len(primes)]:
+            p = primes[k-1]
+            self.assertEqual(p, S.select(k))
+            self.assertEqual(k, S.rank(p))
+            self.assertEqual(k - 1, S.rank(p - 1))
+        with self.assertRaises(IndexError):
+            S.select(len(primes) + 1)
+
+    def test_save_and_load(self):
+        import tempfile
+        S = PrimeSet(100000)
+        with tempfile.TemporaryDirectory() as d:
+            path = d + "/primes.bin"
+            S.save(path)
+            for use_mmap in [True, False]:
+                with PrimeSet.load(path, use_mmap) as T:
+                    self.assertEqual(100000, T.limit)
+                    self.assertEqual(list(S), list(T))
+                    self.assertEqual(9592, T.rank(100000))
+                    self.assertTrue(99991 in T)
+
+    def test_load_rejects_other_files(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as d:
+            path = d + "/other.bin"
+            with open(path, "wb") as f:
+                f.write(b"not a prime set")
+            with self.assertRaises(ValueError):
+                PrimeSet.load(path)
+
 
 class TestSmallestPrimeFactor(unittest.TestCase):
     # smalllab.nt.smallest_prime_factor
@@ -93,11 +393,98 @@ class TestDecompose(unittest.TestCase):
         D = {2017: 1} # prime number
         self.assertEqual(D, decompose(2017))
 
+    def test_large_numbers(self):
+        D = {3: 2, 1009: 1, 134016193603: 1}
+        self.assertEqual(D, decompose(1217001054108843))
+        D = {998244353: 1, 1000000007: 3}
+        self.assertEqual(D, decompose(998244353 * 1000000007**3))
+        D = {274177: 1, 67280421310721: 1}
+        self.assertEqual(D, decompose(2**64 + 1))
+
+    def test_agrees_with_recompose(self):
+        for n in range(2, 3000):
+            D = decompose(n)
+            self.assertEqual(n, recompose(D))
+            self.assertTrue(all(map(is_prime, D)))
+
     def test_number_must_be_greater_than_1(self):
         with self.assertRaises(ValueError):
             decompose(1)
 
 
+class TestFactorCache(unittest.TestCase):
+    # smalllab.nt.FactorCache, enable_factor_cache and disable_factor_cache
+
+    def setUp(self):
+        import tempfile
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = self.dir.name + "/factors.db"
+
+    def tearDown(self):
+        disable_factor_cache()
+        self.dir.cleanup()
+
+    def test_memory_hits(self):
+        cache = enable_factor_cache(min_n=100)
+        n = 998244353 * 1000000007
+        D = decompose(n)
+        self.assertEqual(D, decompose(n))
+        self.assertEqual(n - 998244353 - 1000000007 + 1, totient(n))
+        self.assertEqual(FactorCacheInfo(2, 0, 1, 1, 0), cache.info())
+
+    def test_small_numbers_are_not_cached(self):
+        cache = enable_factor_cache(min_n=100)
+        decompose(99)
+        self.assertEqual(FactorCacheInfo(0, 0, 0, 0, 0), cache.info())
+
+    def test_disk_hits_across_caches(self):
+        enable_factor_cache(self.path, min_n=100)
+        D = decompose(2**64 + 1)
+        cache = enable_factor_cache(self.path, min_n=100)
+        self.assertEqual(D, decompose(2**64 + 1))
+        self.assertEqual(1, cache.info().disk_hits)
+
+    def test_evicts_least_recently_used(self):
+        cache = FactorCache(self.path, maxsize=2, max_disk_entries=2)
+        cache.put(6, {2: 1, 3: 1})
+        cache.put(10, {2: 1, 5: 1})
+        cache.put(14, {2: 1, 7: 1})
+        self.assertEqual(2, cache.info().size)
+        self.assertEqual(2, cache.info().disk_size)
+        cache.close()
+        cache = FactorCache(self.path)
+        self.assertIsNone(cache.get(6))
+        self.assertEqual({2: 1, 5: 1}, cache.get(10))
+        cache.put(22, {2: 1, 11: 1})
+        cache.max_disk_entries = 2
+        cache.put(26, {2: 1, 13: 1})
+        self.assertIsNone(FactorCache(self.path).get(14))
+        cache.close()
+
+    def test_evicts_in_batches(self):
+        cache = FactorCache(self.path, maxsize=0, max_disk_entries=32)
+        primes = primes_between(100, 1000)[:40]
+        for p in primes[:33]:
+            cache.put(p, {p: 1})
+        self.assertEqual(30, cache.info().disk_size)
+        for p in primes[33:]:
+            cache.put(p, {p: 1})
+        # batches of 3 were removed at the 33rd, 36th and 39th writes
+        self.assertEqual(31, cache.info().disk_size)
+        self.assertIsNone(cache.get(primes[8]))
+        self.assertEqual({primes[9]: 1}, cache.get(primes[9]))
+        cache.close()
+
+    def test_wrong_entries_are_removed(self):
+        cache = FactorCache(self.path)
+        cache.put(15, {3: 1, 7: 1})
+        cache.close()
+        cache = FactorCache(self.path)
+        self.assertIsNone(cache.get(15))
+        self.assertEqual(0, cache.info().disk_size)
+        cache.close()
+
+
 class TestRecompose(unittest.TestCase):
     # smalllab.nt.recompose
 
@@ -110,6 +497,43 @@ class TestRecompose(unittest.TestCase):
         self.assertEqual(2017, recompose(D))
 
 
+class TestSPFTable(unittest.TestCase):
+    # smalllab.nt.SPFTable
+
+    def test_smallest_prime_factors(self):
+        T = SPFTable(100)
+        self.assertEqual(101, len(T))
+        self.assertEqual(2, T[64])
+        self.assertEqual(7, T[91])
+        self.assertEqual(97, T[97])
+        self.assertTrue(T.is_prime(97))
+        self.assertFalse(T.is_prime(1))
+
+    def test_factor_agrees_with_decompose(self):
+        T = SPFTable(5000)
+        for n in range(2, 5001):
+            self.assertEqual(decompose(n), T.factor(n))
+
+    def test_factorizations(self):
+        T = SPFTable(1000)
+        L = list(T.factorizations())
+        self.assertEqual(999, len(L))
+        self.assertEqual((12, {2: 2, 3: 1}), L[10])
+        self.assertEqual([(n, decompose(n)) for n in range(990, 1001)],
+            list(T.factorizations(990)))
+
+    def test_out_of_range(self):
+        T = SPFTable(100)
+        with self.assertRaises(ValueError):
+            T.factor(101)
+        with self.assertRaises(IndexError):
+            T[1]
+
+    def test_limit_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            SPFTable(0)
+
+
 class TestDivisorNum(unittest.TestCase):
     # smalllab.nt.divisor_num
 
@@ -142,6 +566,26 @@ class TestDivisorSum(unittest.TestCase):
             divisor_sum(0)
 
 
+class TestDivisors(unittest.TestCase):
+    # smalllab.nt.divisors
+
+    def test_some_values(self):
+        self.assertEqual([1], list(divisors(1)))
+        self.assertEqual([1, 2, 3, 4, 6, 12], list(divisors(-12, ordered=True)))
+        self.assertEqual([1, 2, 4, 8, 16], list(divisors(16, ordered=True)))
+        self.assertEqual([1, 3, 9, 27, 37, 111, 333, 999], sorted(divisors(999)))
+
+    def test_agrees_with_trial_division(self):
+        for n in range(1, 2000):
+            D = [d for d in range(1, n + 1) if n % d == 0]
+            self.assertEqual(D, sorted(divisors(n)))
+            self.assertEqual(D, list(divisors(n, ordered=True)))
+
+    def test_zero_is_invalid(self):
+        with self.assertRaises(ValueError):
+            list(divisors(0))
+
+
 class TestIsPerfect(unittest.TestCase):
     # smalllab.nt.is_perfect
 
@@ -168,6 +612,310 @@ class TestTotient(unittest.TestCase):
             totient(0)
 
 
+class TestMultiplicativeRange(unittest.TestCase):
+    # smalllab.nt.multiplicative_range
+
+    def test_identity_function(self):
+        L = multiplicative_range(100, lambda p, e: p**e)
+        self.assertEqual(list(range(101)), list(L))
+
+    def test_falls_back_to_list(self):
+        L = multiplicative_range(50, lambda p, e: p**(40*e))
+        self.assertIsInstance(L, list)
+        self.assertEqual(12**40, L[12])
+
+    def test_float_typecode(self):
+        L = multiplicative_range(50, lambda p, e: 1 / p**e, "d")
+        self.assertAlmostEqual(1 / 12, L[12])
+
+
+class TestTotientRange(unittest.TestCase):
+    # smalllab.nt.totient_range
+
+    def test_agrees_with_totient(self):
+        L = totient_range(3000)
+        self.assertEqual(0, L[0])
+        for n in range(1, 3001):
+            self.assertEqual(totient(n), L[n])
+
+
+class TestDivisorNumRange(unittest.TestCase):
+    # smalllab.nt.divisor_num_range
+
+    def test_agrees_with_divisor_num(self):
+        L = divisor_num_range(3000)
+        for n in range(1, 3001):
+            self.assertEqual(divisor_num(n), L[n])
+
+
+class TestDivisorSumRange(unittest.TestCase):
+    # smalllab.nt.divisor_sum_range
+
+    def test_agrees_with_divisor_sum(self):
+        L = divisor_sum_range(3000)
+        for n in range(1, 3001):
+            self.assertEqual(divisor_sum(n), L[n])
+
+
+class TestDivisorLists(unittest.TestCase):
+    # smalllab.nt.divisor_lists
+
+    def test_small_tables(self):
+        offsets, values = divisor_lists(1)
+        self.assertEqual([0, 0, 1], list(offsets))
+        self.assertEqual([1], list(values))
+        offsets, values = divisor_lists(6)
+        self.assertEqual([1, 2, 3, 6], list(values[offsets[6]:offsets[7]]))
+
+    def test_agrees_with_divisors(self):
+        N = 5000
+        offsets, values = divisor_lists(N)
+        self.assertEqual(N + 2, len(offsets))
+        for n in range(1, N + 1):
+            self.assertEqual(list(divisors(n, ordered=True)), list(values[offsets[n]:offsets[n+1]]))
+
+
+class TestAliquotEngine(unittest.TestCase):
+    # smalllab.nt.AliquotEngine
+
+    def setUp(self):
+        self.engine = AliquotEngine(table_limit=1000, max_value=10**12)
+
+    def tearDown(self):
+        self.engine.close()
+
+    def test_s_agrees_with_divisor_sum(self):
+        for n in list(range(1, 1100)) + [10**9 + 7, 2**40, 3 * 10**11]:
+            self.assertEqual(divisor_sum(n) - n, self.engine.s(n))
+
+    def test_kinds(self):
+        results = {n: self.engine.follow(n)[1:4] for n in
+            [1, 7, 12, 6, 95, 220, 562, 12496, 14316, 276]}
+        self.assertEqual(("terminating", 0, 0), results[1])
+        self.assertEqual(("terminating", 1, 0), results[7])
+        self.assertEqual(("terminating", 6, 0), results[12])
+        self.assertEqual(("perfect", 0, 1), results[6])
+        self.assertEqual(("perfect", 2, 1), results[95])
+        self.assertEqual(("amicable", 0, 2), results[220])
+        self.assertEqual(("amicable", 1, 2), results[562])
+        self.assertEqual(("sociable", 0, 5), results[12496])
+        self.assertEqual(("sociable", 0, 28), results[14316])
+        self.assertEqual("open", results[276][0])
+
+    def test_max_steps(self):
+        engine = AliquotEngine(table_limit=100, max_steps=3)
+        self.assertEqual(("open", 3), engine.follow(12)[1:3])
+        engine.close()
+
+    def test_sweep(self):
+        perfect = [r.start for r in self.engine.sweep(range(1, 10000), workers=1)
+            if r.kind == "perfect" and r.preperiod == 0]
+        self.assertEqual([6, 28, 496, 8128], perfect)
+        serial = [r[:4] for r in self.engine.sweep(range(1, 2000), workers=1)]
+        self.assertEqual(serial, [r[:4] for r in self.engine.sweep(range(1, 2000), workers=2)])
+
+    def test_sweep_with_disk_cache(self):
+        import os, tempfile
+        dir = tempfile.TemporaryDirectory()
+        self.addCleanup(dir.cleanup)
+        cache = enable_factor_cache(os.path.join(dir.name, "factors.db"), min_n=1)
+        self.addCleanup(disable_factor_cache)
+        engine = AliquotEngine(table_limit=100, max_value=10**12)
+        self.addCleanup(engine.close)
+        list(engine.sweep(range(1000, 1020), workers=1))
+        rows = cache.info().disk_size
+        self.assertGreater(rows, 0)
+        parallel = [r[:4] for r in engine.sweep(range(5000, 5040), workers=2)]
+        # the workers did not write through the parent's connection
+        self.assertEqual(rows, cache.info().disk_size)
+        self.assertEqual([r[:4] for r in engine.sweep(range(5000, 5040), workers=1)], parallel)
+
+    def test_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            self.engine.follow(0)
+
+
+class TestScanRange(unittest.TestCase):
+    # smalllab.nt.scan_range
+
+    def setUp(self):
+        import tempfile, os
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "scan.json")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_without_checkpoint(self):
+        self.assertEqual(primes_between(0, 1000), scan_range(is_prime, 0, 1000, chunk_size=7))
+
+    def test_resume_after_crash(self):
+        class Crash(Exception):
+            pass
+        calls = []
+        def fermat(n):
+            calls.append(n)
+            if n == 2499 and len(calls) == 2500:
+                raise Crash
+            return n > 2 and power_mod(2, n - 1, n) == 1
+
+        with self.assertRaises(Crash):
+            scan_range(fermat, 0, 10000, self.path, chunk_size=1000, interval=0, key="fermat")
+        self.assertEqual(2499, calls[-1])
+        calls.clear()
+        L = scan_range(fermat, 0, 10000, self.path, chunk_size=1000, interval=0, key="fermat")
+        self.assertEqual(2000, calls[0])
+        self.assertEqual([n for n in range(3, 10000) if pow(2, n - 1, n) == 1], L)
+        calls.clear()
+        self.assertEqual(L, scan_range(fermat, 0, 10000, self.path, chunk_size=1000, key="fermat"))
+        self.assertEqual([], calls)
+
+    def test_corrupted_checkpoint(self):
+        import json
+        scan_range(is_perfect, 1, 1000, self.path)
+        with open(self.path + ".results", "r+b") as f:
+            f.write(b"7")
+        with self.assertRaises(ValueError):
+            scan_range(is_perfect, 1, 1000, self.path)
+        scan_range(is_perfect, 1, 1000, self.path + "2")
+        with open(self.path + "2") as f:
+            state = json.load(f)
+        state["position"] = 500
+        with open(self.path + "2", "w") as f:
+            json.dump(state, f)
+        with self.assertRaises(ValueError):
+            scan_range(is_perfect, 1, 1000, self.path + "2")
+
+    def test_results_appended(self):
+        calls = []
+        def fermat(n):
+            calls.append(n)
+            return n > 2 and pow(2, n - 1, n) == 1
+        expected = [n for n in range(3, 2000) if pow(2, n - 1, n) == 1]
+        scan_range(fermat, 0, 1000, self.path, chunk_size=100, interval=0, key="fermat")
+        data = b"".join(b"%d\n" % n for n in expected if n < 1000)
+        with open(self.path + ".results", "rb") as f:
+            self.assertEqual(data, f.read())
+        # the line a crash left after the last save is dropped on resume
+        with open(self.path + ".results", "ab") as f:
+            f.write(b"12")
+        self.assertEqual([n for n in expected if n < 1000],
+            scan_range(fermat, 0, 1000, self.path, chunk_size=100, key="fermat"))
+        with open(self.path + ".results", "rb") as f:
+            self.assertEqual(data, f.read())
+        # a new scan does not keep the results of a deleted checkpoint
+        import os
+        os.remove(self.path)
+        calls.clear()
+        self.assertEqual(expected, scan_range(fermat, 0, 2000, self.path, key="fermat"))
+        self.assertEqual(2000, len(calls))
+
+    def test_partial(self):
+        from functools import partial
+        fermat = partial(power_mod, 3)
+        predicate = partial(lambda f, n: f(n - 1, n) == 1, fermat)
+        L = scan_range(predicate, 3, 3000, self.path, key="fermat-3")
+        self.assertEqual([n for n in range(3, 3000) if pow(3, n - 1, n) == 1], L)
+        self.assertEqual(L, scan_range(predicate, 3, 3000, self.path, key="fermat-3"))
+        with self.assertRaises(ValueError):
+            scan_range(predicate, 3, 3000, self.path)
+
+    def test_different_lambdas(self):
+        self.assertEqual([0, 2, 4, 6, 8], scan_range(lambda n: n % 2 == 0, 0, 10, self.path))
+        with self.assertRaises(ValueError):
+            scan_range(lambda n: n % 3 == 0, 0, 10, self.path)
+        with self.assertRaises(ValueError):
+            scan_range(lambda n: n % 3 == 0, 0, 10, self.path, key="multiples of 3")
+        self.assertEqual([0, 3, 6, 9], scan_range(lambda n: n % 3 == 0, 0, 10,
+            self.path + "3", key="multiples of 3"))
+
+    def test_other_scan(self):
+        scan_range(is_perfect, 1, 1000, self.path)
+        with self.assertRaises(ValueError):
+            scan_range(is_perfect, 1, 2000, self.path)
+        with self.assertRaises(ValueError):
+            scan_range(is_prime, 1, 1000, self.path)
+
+
+class TestToBase(unittest.TestCase):
+    # smalllab.nt.to_base
+
+    def test_some_values(self):
+        self.assertEqual("0", to_base(0, 7))
+        self.assertEqual("1001010110001", to_base(4785, 2))
+        self.assertEqual("12b1", to_base(4785, 16))
+        self.assertEqual("4lh", to_base(4785, 32))
+        self.assertEqual("3ox", to_base(4785, 36))
+
+    def test_large_numbers(self):
+        n = 3**5000 + 12345
+        self.assertEqual(format(n, "o"), to_base(n, 8))
+        digits = to_base(n, 3)
+        self.assertEqual("1" + "0"*4991 + "121221020", digits)
+        digits = to_base(2**20000, 10)
+        self.assertEqual(6021, len(digits))
+        self.assertEqual("3980276840", digits[:10])
+        self.assertEqual("3406309376", digits[-10:])
+
+    def test_base_between_2_and_36(self):
+        with self.assertRaises(ValueError):
+            to_base(10, 37)
+        with self.assertRaises(ValueError):
+            to_base(10, 1)
+
+    def test_only_for_nonnegative_integer(self):
+        with self.assertRaises(ValueError):
+            to_base(-2, 10)
+
+
+class TestFromBase(unittest.TestCase):
+    # smalllab.nt.from_base
+
+    def test_some_values(self):
+        self.assertEqual(4785, from_base("12b1", 16))
+        self.assertEqual(4785, from_base("12B1", 16))
+        self.assertEqual(4785, from_base("4lh", 32))
+        self.assertEqual(0, from_base("000", 5))
+
+    def test_inverse_of_to_base(self):
+        n = 7**3000 + 1
+        for base in [2, 4, 10, 12, 32, 36]:
+            self.assertEqual(n, from_base(to_base(n, base), base))
+
+    def test_invalid_digits(self):
+        for s in ["", "12a", "-12", "+12", "1_000", " 12"]:
+            with self.assertRaises(ValueError):
+                from_base(s, 10)
+
+    def test_only_for_string(self):
+        with self.assertRaises(TypeError):
+            from_base(1101, 2)
+
+
+class TestWriteReadBase(unittest.TestCase):
+    # smalllab.nt.write_base and smalllab.nt.read_base
+
+    def test_round_trip(self):
+        from io import StringIO
+        n = 5**4000 + 17
+        for base in [2, 10, 16, 23]:
+            fp = StringIO()
+            count = write_base(n, base, fp)
+            self.assertEqual(to_base(n, base), fp.getvalue())
+            self.assertEqual(count, len(fp.getvalue()))
+            fp.seek(0)
+            self.assertEqual(n, read_base(fp, base, chunk_size=100))
+
+    def test_ignores_whitespace(self):
+        from io import StringIO
+        self.assertEqual(123456789, read_base(StringIO("1234\n5678\n9\n"), 10, 3))
+
+    def test_no_digits(self):
+        from io import StringIO
+        with self.assertRaises(ValueError):
+            read_base(StringIO("  \n"), 10)
+
+
 class TestDecimal2Binary(unittest.TestCase):
     # smalllab.nt.decimal2binary
 
@@ -200,6 +948,35 @@ class TestBinary2Decimal(unittest.TestCase):
             binary2decimal(1101)
 
 
+class TestModContext(unittest.TestCase):
+    # smalllab.nt.ModContext
+
+    def test_pow(self):
+        c = ModContext(853)
+        self.assertEqual(286, c.pow(7, 327))
+        self.assertEqual(1, c.pow(7, 0))
+        self.assertEqual(0, ModContext(1).pow(7, 3))
+
+    def test_precomputed_base(self):
+        m = 2**127 - 1
+        c = ModContext(m)
+        c.precompute(3, 130)
+        for k in [0, 1, 15, 16, 2**64 + 7, 2**130 - 1, 2**200 + 3]:
+            self.assertEqual(pow(3, k, m), c.pow(3, k))
+
+    def test_pow_many(self):
+        c = ModContext(101)
+        self.assertEqual([pow(a, 50, 101) for a in range(10)], c.pow_many(range(10), 50))
+
+    def test_modulus_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            ModContext(0)
+
+    def test_exponent_must_be_nonnegative(self):
+        with self.assertRaises(ValueError):
+            ModContext(7).pow(2, -1)
+
+
 class TestPowerMod(unittest.TestCase):
     # smalllab.nt.power_mod
 
@@ -208,5 +985,72 @@ class TestPowerMod(unittest.TestCase):
         self.assertEqual(280196559097287, power_mod(2, 283976710803262, 283976710803263))
         self.assertEqual(1, power_mod(3, 630249099480, 630249099481))
 
+    def test_uses_precomputed_table(self):
+        from smalllab.nt import _mod_contexts
+        m = 1000003
+        self.addCleanup(_mod_contexts.pop, m, None)
+        mod_context(m).precompute(5, 64)
+        self.assertEqual(pow(5, 2**63 + 11, m), power_mod(5, 2**63 + 11, m))
+
+    def test_zero_exponent(self):
+        self.assertEqual(1, power_mod(7, 0, 853))
+
+    def test_without_context(self):
+        self.assertEqual(pow(3, 10**20, 10**9 + 9), power_mod(3, 10**20, 10**9 + 9))
+        self.assertEqual(-2, power_mod(3, 5, -7))
+
+
+class TestPseudoprimesBetween(unittest.TestCase):
+    # smalllab.nt.pseudoprimes_between
+
+    def test_fermat_pseudoprimes(self):
+        L = list(pseudoprimes_between(0, 3000, workers=1))
+        self.assertEqual([341, 561, 645, 1105, 1387, 1729, 1905, 2047, 2465, 2701, 2821], L)
+        self.assertEqual(245, len(list(pseudoprimes_between(0, 10**6, workers=1))))
+
+    def test_agrees_with_direct_test(self):
+        lo, hi = 10**6, 10**6 + 300000
+        for bases in [(2,), (3,), (6,), (2, 3)]:
+            L = [n for n in range(lo + 1, hi, 2) if not is_prime(n)
+                and all(pow(a, n-1, n) == 1 for a in bases)]
+            self.assertEqual(L, list(pseudoprimes_between(lo, hi, bases, workers=1)))
+
+    def test_strong_pseudoprimes(self):
+        L = list(pseudoprimes_between(0, 10**5, (2,), strong=True, workers=1))
+        self.assertEqual([2047, 3277, 4033, 4681, 8321, 15841, 29341, 42799,
+            49141, 52633, 65281, 74665, 80581, 85489, 88357, 90751], L)
+        self.assertEqual([3215031751], list(pseudoprimes_between(3215031700,
+            3215031800, (2, 3, 5, 7), strong=True, workers=1)))
+
+    def test_parallel_equals_serial(self):
+        serial = list(pseudoprimes_between(0, 700000, (2,), workers=1))
+        self.assertEqual(serial, list(pseudoprimes_between(0, 700000, (2,), workers=2)))
+
+    def test_bases_greater_than_1(self):
+        with self.assertRaises(ValueError):
+            list(pseudoprimes_between(0, 100, (1,)))
+
+
+class TestIsCarmichael(unittest.TestCase):
+    # smalllab.nt.is_carmichael
+
+    def test_carmichael_numbers(self):
+        for n in [561, 1105, 1729, 2465, 2821, 6601, 8911, 9746347772161]:
+            self.assertTrue(is_carmichael(n))
+
+    def test_non_carmichael_numbers(self):
+        for n in [1, 2, 341, 560, 563, 645, 1387, 9 * 61]:
+            self.assertFalse(is_carmichael(n))
+
+
+class TestCarmichaelBetween(unittest.TestCase):
+    # smalllab.nt.carmichael_between
+
+    def test_some_intervals(self):
+        self.assertEqual([561, 1105, 1729, 2465, 2821, 6601, 8911],
+            list(carmichael_between(0, 10000, workers=1)))
+        self.assertEqual(43, len(list(carmichael_between(0, 10**6, workers=2))))
+
+
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 import lib_path_from_tests
 from smalllab.numeric import *
-from math import exp
+from math import cos, exp, sin
 
 class TestBisect(unittest.TestCase):
     # smalllab.numeric.bisect
@@ -120,6 +120,63 @@ class TestNearMinimax(unittest.TestCase):
             self.assertLessEqual(diff, max_error)
 
 
+class TestChebyshevSeries(unittest.TestCase):
+    # smalllab.numeric.ChebyshevSeries
+
+    def test_clenshaw(self):
+        c = ChebyshevSeries([1, 2, 3])
+        for x in [-1, -0.3, 0, 0.5, 1]:
+            self.assertAlmostEqual(1 + 2*x + 3*(2*x*x - 1), c(x))
+        c = ChebyshevSeries([0, 0, 1], (0, 4))
+        self.assertAlmostEqual(1, c(0))
+        self.assertAlmostEqual(-1, c(2))
+
+    def test_fit_agrees_with_direct_dct(self):
+        from math import pi
+        for n in [0, 1, 4, 7, 12, 31]:
+            N = n + 1
+            nodes = [cos((2*j+1) * pi / (2*N)) for j in range(N)]
+            coefs = [2 / N * sum(exp(x) * cos(k * (2*j+1) * pi / (2*N))
+                for j, x in enumerate(nodes)) for k in range(N)]
+            coefs[0] /= 2
+            for a, b in zip(coefs, ChebyshevSeries.fit(exp, n).coefs):
+                self.assertAlmostEqual(a, b)
+
+    def test_fit_to_machine_precision(self):
+        c = ChebyshevSeries.fit(exp)
+        self.assertLess(len(c.coefs), 40)
+        for j in range(-100, 101):
+            self.assertAlmostEqual(exp(j / 100), c(j / 100), places=14)
+        c = ChebyshevSeries.fit(sin, domain=(0, 10))
+        for j in range(101):
+            self.assertAlmostEqual(sin(j / 10), c(j / 10), places=14)
+
+    def test_fit_unresolved(self):
+        with self.assertRaises(ValueError):
+            ChebyshevSeries.fit(abs)
+
+    def test_truncate(self):
+        c = ChebyshevSeries([1.0, 0.5, 1e-3, 1e-17, 0.0])
+        self.assertEqual([1.0, 0.5, 1e-3], c.truncate(1e-16).coefs)
+        self.assertEqual([1.0], c.truncate(1.0).coefs)
+
+    def test_derivative_and_integral(self):
+        c = ChebyshevSeries([1, 2, 3])
+        self.assertEqual([2, 12], c.derivative().coefs)
+        self.assertEqual([-0.5, -0.5, 0.5, 0.5], c.integral().coefs)
+        c = ChebyshevSeries.fit(sin, domain=(0, 10))
+        d, i = c.derivative(), c.integral()
+        for j in range(101):
+            self.assertAlmostEqual(cos(j / 10), d(j / 10), places=11)
+            self.assertAlmostEqual(1 - cos(j / 10), i(j / 10), places=14)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            ChebyshevSeries([])
+        with self.assertRaises(ValueError):
+            ChebyshevSeries([1], (1, 1))
+
+
 class TestTrapezoidal(unittest.TestCase):
     # smalllab.numeric.trapezoidal
 